@@ -4,26 +4,40 @@ Example configuration file. Copy to config.py and fill secrets.
 
 import os
 import os.path
+from functools import lru_cache
 
 
+# Secret files are read once per process; each helper below costs at most one stat + one read per
+# path, and re-validating a file that was already read doesn't touch the filesystem again.
+@lru_cache(maxsize=None)
+def _stat_secret(filename: str) -> tuple[bool, int]:
+    """Return (exists, size) for a file in the secrets/ folder with a single stat call."""
+    try:
+        return True, os.stat(os.path.join("secrets", filename)).st_size
+    except FileNotFoundError:
+        return False, 0
+
+
+@lru_cache(maxsize=None)
 def _read_secret_file(filename: str) -> str:
     """Read a secret from the secrets/ folder."""
     secrets_path = os.path.join("secrets", filename)
-    if not os.path.exists(secrets_path):
+    try:
+        with open(secrets_path) as f:
+            content = f.read().strip()
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Secret file not found: {secrets_path}\n"
             f"Please create this file with your API key/secret.\n"
             f"See INSTALL.md for setup instructions."
+        ) from None
+    if not content:
+        raise ValueError(
+            f"Secret file is empty: {secrets_path}\n"
+            f"Please add your API key/secret to this file.\n"
+            f"See INSTALL.md for setup instructions."
         )
-    with open(secrets_path) as f:
-        content = f.read().strip()
-        if not content:
-            raise ValueError(
-                f"Secret file is empty: {secrets_path}\n"
-                f"Please add your API key/secret to this file.\n"
-                f"See INSTALL.md for setup instructions."
-            )
-        return content
+    return content
 
 
 def _validate_secret_file(filename: str, description: str | None = None) -> None:
@@ -32,14 +46,15 @@ def _validate_secret_file(filename: str, description: str | None = None) -> None
     Raises FileNotFoundError or ValueError if validation fails.
     """
     secrets_path = os.path.join("secrets", filename)
-    if not os.path.exists(secrets_path):
+    exists, size = _stat_secret(filename)
+    if not exists:
         desc = f" ({description})" if description else ""
         raise FileNotFoundError(
             f"Secret file not found: {secrets_path}{desc}\n"
             f"Please create this file with your API key/secret.\n"
             f"See INSTALL.md for setup instructions."
         )
-    if os.path.getsize(secrets_path) == 0:
+    if size == 0:
         desc = f" ({description})" if description else ""
         raise ValueError(
             f"Secret file is empty: {secrets_path}{desc}\n"
@@ -48,19 +63,23 @@ def _validate_secret_file(filename: str, description: str | None = None) -> None
         )
 
 
+@lru_cache(maxsize=None)
 def _read_secret_file_optional(filename: str) -> str | None:
     """Read a secret file if it exists and is not empty; return None otherwise."""
-    secrets_path = os.path.join("secrets", filename)
-    if not os.path.exists(secrets_path):
+    try:
+        with open(os.path.join("secrets", filename)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
         return None
-    with open(secrets_path) as f:
-        content = f.read().strip()
-        return content or None
 
 
 DEBUG = os.getenv("DEBUG", "1") == "1"
 LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO")
 
+# Swagger UI (/api-docs) and /apispec.json. Set ENABLE_API_DOCS=0 to skip flasgger setup entirely
+# (faster API cold start, less memory) on deployments that don't need the docs.
+ENABLE_API_DOCS = os.getenv("ENABLE_API_DOCS", "1") == "1"
+
 # Optional (docker-compose) scheduler knobs:
 # - FORCE_PARSE_ON_START=1
 #     Force a one-time re-parse on container startup for BOTH XLSX + PDF
@@ -147,23 +166,36 @@ GOOGLE_CALENDAR_REMINDERS = [
 ]
 
 
-API_KEY = _read_secret_file("api_key.txt")
 API_KEY_HEADER = "X-API-KEY"
 
 
-try:
-    _validate_secret_file("api_key.txt", "API authentication key")
-    _validate_secret_file("credentials.json", "Google Calendar Service Account credentials")
-    if not any(provider.get("api_key") for provider in AI_PROVIDERS):
-        raise ValueError(
-            "No AI provider API keys found. Add at least one of: "
-            "secrets/openrouter_api_key.txt, secrets/groq_api_key.txt, "
-            "secrets/huggingface_api_key.txt, secrets/gemini_api_key.txt, "
-            "secrets/mistral_api_key.txt"
-        )
-except (FileNotFoundError, ValueError) as e:
-    raise RuntimeError(
-        f"Configuration validation failed:\n{e}\n\n"
-        f"Please ensure all required secret files exist and are not empty.\n"
-        f"See INSTALL.md for detailed setup instructions."
-    ) from e
+def __getattr__(name: str) -> str:
+    # API_KEY is read from secrets/ on first access instead of at import (PEP 562)
+    if name == "API_KEY":
+        return _read_secret_file("api_key.txt")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def validate_config(require_ai: bool = True) -> None:
+    """
+    Check that the required secret files exist and are not empty.
+
+    Called once by service entrypoints at startup (importing this module doesn't touch secrets/
+    beyond the optional AI keys). Pass require_ai=False for services that never call an AI provider.
+    """
+    try:
+        _read_secret_file("api_key.txt")
+        _validate_secret_file("credentials.json", "Google Calendar Service Account credentials")
+        if require_ai and not any(provider.get("api_key") for provider in AI_PROVIDERS):
+            raise ValueError(
+                "No AI provider API keys found. Add at least one of: "
+                "secrets/openrouter_api_key.txt, secrets/groq_api_key.txt, "
+                "secrets/huggingface_api_key.txt, secrets/gemini_api_key.txt, "
+                "secrets/mistral_api_key.txt"
+            )
+    except (FileNotFoundError, ValueError) as e:
+        raise RuntimeError(
+            f"Configuration validation failed:\n{e}\n\n"
+            f"Please ensure all required secret files exist and are not empty.\n"
+            f"See INSTALL.md for detailed setup instructions."
+        ) from e
@@ -2,12 +2,31 @@
 Flask API application for waste schedule data
 """
 
+import gzip
+import hashlib
 import logging
+import re
 import sys
+import threading
+import time
+import unicodedata
+from collections.abc import Callable, Iterable, Iterator
+from functools import wraps
 from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
 
+import orjson
 from flasgger import Swagger
-from flask import Flask, jsonify, redirect, render_template, request
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    redirect,
+    render_template,
+    request,
+)
+from werkzeug.exceptions import MethodNotAllowed
 
 REPO_ROOT = Path(__file__).resolve().parent.parent.parent
 # When running as a script (e.g. `python services/api/app.py`), ensure repo root is on sys.path
@@ -17,16 +36,20 @@ if str(REPO_ROOT) not in sys.path:
 
 import config  # noqa: E402
 from services.api.db import (
-    get_all_locations,
+    get_available_waste_types_for_house_numbers,
     get_available_waste_types_for_selection,
+    get_available_waste_types_for_streets,
+    get_data_version,
     get_house_numbers_for_street,
-    get_location_by_selection,
+    get_location_hierarchy,
     get_location_schedule,
     get_multi_waste_schedule_for_selection,
     get_pdf_streetwide_waste_types_for_selection,
     get_schedule_group_schedule,
     get_streets_for_village,
     get_unique_villages,
+    iter_all_locations,
+    resolve_schedule,
     search_locations,
     street_has_house_numbers,
     village_has_streets,
@@ -36,6 +59,7 @@ from services.common.calendar_client import (
     get_existing_calendar_info,
     list_available_calendars,
 )
+from services.common.config_utils import validate_config
 from services.common.logging_utils import setup_logging
 
 setup_logging()
@@ -76,15 +100,223 @@ swagger_template = {
     "securityDefinitions": {},
 }
 
-Swagger(app, config=swagger_config, template=swagger_template)
+# The spec only changes on deploy; let the Swagger UI / proxies reuse it for an hour
+_APISPEC_MAX_AGE_SECONDS = 3600
+
+
+def _snapshot_apispec(view: Callable[..., Any]) -> Callable[..., Response]:
+    """Build the flasgger spec once and serve those bytes afterwards (docstrings can't change)"""
+    snapshot: list[bytes] = []
+
+    @wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Response:
+        if not snapshot:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            snapshot.append(response.get_data())
+
+        response = Response(snapshot[0], mimetype="application/json")
+        response.headers["Cache-Control"] = f"public, max-age={_APISPEC_MAX_AGE_SECONDS}"
+        return response
+
+    return wrapper
+
+
+# getattr: config.py is a local copy of config.example.py and may predate this setting
+if getattr(config, "ENABLE_API_DOCS", True):
+    Swagger(app, config=swagger_config, template=swagger_template)
+    # flasgger re-parses every route's YAML docstring on each /apispec.json hit
+    app.view_functions["flasgger.apispec"] = _snapshot_apispec(
+        app.view_functions["flasgger.apispec"]
+    )
+
+
+# orjson is a C serializer that produces bytes directly; noticeably faster than flask.jsonify on
+# the large location/village payloads.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def ojsonify(obj: Any, status: int = 200) -> Response:
+    """Serialize `obj` with orjson into a JSON response (drop-in for flask.jsonify)."""
+    return Response(
+        orjson.dumps(obj, option=_ORJSON_OPTIONS), status=status, mimetype="application/json"
+    )
+
+
+# Process-local cache of pre-serialized GET responses for data that only changes when the
+# scrapers write. Entries are keyed by path + the (sorted) query args the view reads and hold
+# (data_version, etag, body, gzipped_body, expires_at); a changed data_version
+# (see services.common.db.get_data_version) invalidates them before the TTL does.
+# Bodies of at least _GZIP_MIN_SIZE bytes are gzipped once when cached (other JSON responses are
+# compressed per request by gzip_json_response).
+_CACHE: dict[tuple[str, str], tuple[str, str, bytes, bytes | None, float]] = {}
+_CACHE_TTL_SECONDS = 300
+_CACHE_MAX_ENTRIES = 2048
+# gthread workers serve requests concurrently; evict + insert must not interleave
+_CACHE_LOCK = threading.Lock()
+_GZIP_MIN_SIZE = 1024
+_GZIP_LEVEL = 6
+
+
+def cached_get(*params: str) -> Callable[[Callable[..., Response]], Callable[..., Response]]:
+    """Cache a JSON view's 200 responses, answering 304 on a matching ETag.
+
+    `params` are the query args the view reads; only those go into the cache key, so unrelated
+    args ('?x=1', '?x=2', ...) can't fill the cache with copies of one response.
+    Error responses are passed through uncached.
+    """
+    used = frozenset(params)
+
+    def decorator(view: Callable[..., Response]) -> Callable[..., Response]:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Response:
+            # Sorted args: '?a=1&b=2' and '?b=2&a=1' share one entry
+            used_args = (item for item in request.args.items(multi=True) if item[0] in used)
+            key = (request.path, urlencode(sorted(used_args)))
+            data_version = get_data_version()
+            now = time.monotonic()
+            entry = _CACHE.get(key)
+            if entry is None or entry[0] != data_version or entry[4] <= now:
+                response = view(*args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+                gzipped = None
+                if len(body) >= _GZIP_MIN_SIZE:
+                    gzipped = gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0)
+                entry = (data_version, etag, body, gzipped, now + _CACHE_TTL_SECONDS)
+                with _CACHE_LOCK:
+                    if key not in _CACHE and len(_CACHE) >= _CACHE_MAX_ENTRIES:
+                        _CACHE.pop(next(iter(_CACHE), None), None)
+                    _CACHE[key] = entry
+
+            _, etag, body, gzipped, _ = entry
+            if gzipped is not None and "gzip" in request.accept_encodings:
+                response = Response(gzipped, mimetype="application/json")
+                response.headers["Content-Encoding"] = "gzip"
+                etag = f"{etag}-gz"
+            else:
+                response = Response(body, mimetype="application/json")
+            response.vary.add("Accept-Encoding")
+            response.set_etag(etag)
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
+
+
+_Q_DISALLOWED = re.compile(r"[^\w\s\-.]")
+_Q_MAX_LENGTH = 64
+
+
+def clean_q(q: str) -> str:
+    """Normalize a search query: NFC, punctuation dropped, trimmed, lowercased, length-capped"""
+    return _Q_DISALLOWED.sub("", unicodedata.normalize("NFC", q)).strip().lower()[:_Q_MAX_LENGTH]
+
+
+def _selection_args() -> tuple[str, str, str | None, str | None]:
+    """Read seniunija, village, street, house_numbers from the query string in one pass
+
+    street/house_numbers are None when the parameter is absent ('' when given empty).
+    """
+    args = request.args
+    return (
+        args.get("seniunija", ""),
+        args.get("village", ""),
+        args.get("street"),
+        args.get("house_numbers"),
+    )
+
+
+def _wants_columnar() -> bool:
+    """?format=soa: the client wants lists of objects as columns (one array per field)"""
+    return request.args.get("format") == "soa"
 
 
-# Security: Only allow GET methods for API endpoints
-@app.before_request
-def only_get_allowed():
-    """Reject all non-GET requests for security"""
-    if request.method != "GET" and request.path.startswith("/api/"):
-        return jsonify({"error": "Only GET method is allowed"}), 405
+_LOCATION_FIELDS = ("id", "seniunija", "village", "street", "house_numbers", "kaimai_hash")
+
+
+def _columnar_locations(locations: Iterable[dict]) -> dict[str, list]:
+    """Locations as {"id": [...], "seniunija": [...], ...} (same order; keys aren't repeated)"""
+    columns: dict[str, list] = {field: [] for field in _LOCATION_FIELDS}
+    appends = [(field, columns[field].append) for field in _LOCATION_FIELDS]
+    for location in locations:
+        for field, append in appends:
+            append(location[field])
+    return columns
+
+
+def _with_columnar_dates(schedule: dict) -> dict:
+    """
+    Return `schedule` with dates as {"date": [...], "waste_type": [...]} instead of
+    [{"date": ..., "waste_type": ...}, ...] (same order; the keys aren't repeated per date)
+    """
+    dates = schedule.get("dates") or []
+    if not all(isinstance(d, dict) for d in dates):
+        return schedule
+    return {
+        **schedule,
+        "dates": {
+            "date": [d["date"] for d in dates],
+            "waste_type": [d["waste_type"] for d in dates],
+        },
+    }
+
+
+# Versioned JSON API; registered on the app at the bottom of this module, once all routes exist
+api = Blueprint("api_v1", __name__, url_prefix="/api/v1")
+
+
+# Security: API routes are declared GET-only (Flask adds HEAD/OPTIONS); anything else is a 405.
+# Registered on the app: a method mismatch is a routing error, which never reaches blueprint handlers.
+@app.errorhandler(405)
+def method_not_allowed(error: MethodNotAllowed):
+    """Answer rejected methods on API paths with a JSON error"""
+    if not request.path.startswith("/api/"):
+        return error
+    response = ojsonify({"error": "Only GET method is allowed"}, status=405)
+    response.headers["Allow"] = ", ".join(sorted(error.valid_methods or ()))
+    return response
+
+
+@api.after_request
+def add_cache_headers(response: Response) -> Response:
+    """Let browsers and proxies cache successful API reads (revalidated through the ETag)"""
+    if (
+        request.method in ("GET", "HEAD")
+        and response.status_code in (200, 304)
+        and "Cache-Control" not in response.headers
+    ):
+        response.headers["Cache-Control"] = f"public, max-age={_CACHE_TTL_SECONDS}"
+    return response
+
+
+@app.after_request
+def gzip_json_response(response: Response) -> Response:
+    """Gzip JSON bodies that weren't already served precompressed from the response cache"""
+    if (
+        response.mimetype != "application/json"
+        or response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if "gzip" not in request.accept_encodings:
+        return response
+
+    body = response.get_data()
+    if len(body) < _GZIP_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
 
 
 @app.route("/")
@@ -99,7 +331,8 @@ def api_docs():
     return redirect("/api-docs/index.html")
 
 
-@app.route("/api/v1/locations", methods=["GET"])
+@api.route("/locations", methods=["GET"])
+@cached_get("q", "format")
 def api_locations():
     """
     Get all locations or search locations
@@ -111,7 +344,13 @@ def api_locations():
         in: query
         type: string
         required: false
-        description: Search query (searches in seniunija, village, and street names)
+        description: Search query (word-prefix match on seniunija, village and street names; case/diacritic-insensitive, max 64 characters)
+      - name: format
+        in: query
+        type: string
+        required: false
+        enum: [soa]
+        description: 'soa returns "locations" as one array per field ("id": [...], "village": [...], ...) instead of one object per location'
     responses:
       200:
         description: List of locations
@@ -139,17 +378,39 @@ def api_locations():
             count:
               type: integer
     """
-    query = request.args.get("q", "")
-
-    if query:
-        locations = search_locations(query)
-    else:
-        locations = get_all_locations()
-
-    return jsonify({"locations": locations, "count": len(locations)})
-
-
-@app.route("/api/v1/schedule", methods=["GET"])
+    # A blank q counts as not supplied; one with content that cleans down to "" (e.g. "!!!") is a
+    # search with no matches, not a request for every location
+    raw_query = request.args.get("q", "").strip()
+    query = clean_q(raw_query)
+
+    columnar = _wants_columnar()
+
+    if raw_query or columnar:
+        locations = search_locations(query) if raw_query else list(iter_all_locations())
+        if columnar:
+            return ojsonify({"locations": _columnar_locations(locations), "count": len(locations)})
+        return ojsonify({"locations": locations, "count": len(locations)})
+
+    # The full dump is encoded once per data version (cached_get keeps the body, its ETag and the
+    # gzipped copy), straight from the cursor without building the list of dicts first
+    return Response(_encode_locations(iter_all_locations()), mimetype="application/json")
+
+
+def _encode_locations(locations: Iterator[dict]) -> bytes:
+    """Encode {"locations": [...], "count": n} row by row instead of building the list first"""
+    parts = [b'{"locations":[']
+    count = 0
+    for location in locations:
+        if count:
+            parts.append(b",")
+        parts.append(orjson.dumps(location, option=_ORJSON_OPTIONS))
+        count += 1
+    parts.append(b'],"count":' + str(count).encode() + b"}")
+    return b"".join(parts)
+
+
+@api.route("/schedule", methods=["GET"])
+@cached_get("location_id", "seniunija", "village", "street", "house_numbers", "format")
 def api_schedule():
     """
     Get schedule for a specific location
@@ -182,6 +443,12 @@ def api_schedule():
         type: string
         required: false
         description: House numbers (required if street has specific house numbers)
+      - name: format
+        in: query
+        type: string
+        required: false
+        enum: [soa]
+        description: 'soa returns dates as parallel "date" and "waste_type" arrays (one object per date otherwise)'
     responses:
       200:
         description: Schedule data
@@ -240,10 +507,7 @@ def api_schedule():
         description: Location not found
     """
     location_id = request.args.get("location_id", type=int)
-    seniunija = request.args.get("seniunija", "")
-    village = request.args.get("village", "")
-    street = request.args.get("street", None)  # None if not provided, '' if empty string provided
-    house_numbers = request.args.get("house_numbers", None)  # None if not provided
+    seniunija, village, street, house_numbers = _selection_args()
 
     if location_id:
         schedule = get_location_schedule(location_id=location_id)
@@ -252,49 +516,38 @@ def api_schedule():
         # 1. If village has streets, street parameter must be provided
         # 2. If street has house numbers, house_numbers parameter must be provided
 
-        if village_has_streets(seniunija, village):
+        resolved = resolve_schedule(seniunija, village, street, house_numbers)
+
+        if resolved["has_streets"] and street is None:
             # Village has streets, so street must be provided
-            if street is None:
-                return (
-                    jsonify({"error": "This village has streets. Please select a street."}),
-                    400,
-                )
-            street_value = street
-        else:
-            # Village has no streets, use empty string
-            street_value = ""
-
-        # Check if street has house numbers
-        if street_has_house_numbers(seniunija, village, street_value):
+            return ojsonify(
+                {"error": "This village has streets. Please select a street."}, status=400
+            )
+
+        if resolved["has_house_numbers"] and house_numbers is None:
             # Street has house numbers, so house_numbers must be provided
-            if house_numbers is None:
-                return (
-                    jsonify(
-                        {
-                            "error": "This street has specific house numbers. Please select a house number."
-                        }
-                    ),
-                    400,
-                )
-
-        location = get_location_by_selection(seniunija, village, street_value, house_numbers)
-        if location:
-            schedule = get_location_schedule(location_id=location["id"])
-        else:
-            schedule = None
+            return ojsonify(
+                {"error": "This street has specific house numbers. Please select a house number."},
+                status=400,
+            )
+
+        schedule = resolved["schedule"]
     else:
-        return (
-            jsonify({"error": "Must provide either location_id or both seniunija and village"}),
-            400,
+        return ojsonify(
+            {"error": "Must provide either location_id or both seniunija and village"}, status=400
         )
 
     if not schedule:
-        return jsonify({"error": "Location not found"}), 404
+        return ojsonify({"error": "Location not found"}, status=404)
 
-    return jsonify(schedule)
+    if _wants_columnar():
+        schedule = _with_columnar_dates(schedule)
 
+    return ojsonify(schedule)
 
-@app.route("/api/v1/schedule-multi", methods=["GET"])
+
+@api.route("/schedule-multi", methods=["GET"])
+@cached_get("seniunija", "village", "street", "house_numbers")
 def api_schedule_multi():
     """
     Get combined schedule for a selection across waste types (bendros/plastikas/stiklas).
@@ -326,20 +579,16 @@ def api_schedule_multi():
       400:
         description: Bad request (missing required parameters)
     """
-    seniunija = request.args.get("seniunija", "")
-    village = request.args.get("village", "")
-    street = request.args.get("street", None)
-    house_numbers = request.args.get("house_numbers", None)
+    seniunija, village, street, house_numbers = _selection_args()
 
     if not (seniunija and village):
-        return jsonify({"error": "Must provide seniunija and village"}), 400
+        return ojsonify({"error": "Must provide seniunija and village"}, status=400)
 
     # Normalize selection like api_schedule does (street param requirements)
     if village_has_streets(seniunija, village):
         if street is None:
-            return (
-                jsonify({"error": "This village has streets. Please select a street."}),
-                400,
+            return ojsonify(
+                {"error": "This village has streets. Please select a street."}, status=400
             )
         street_value = street
     else:
@@ -350,10 +599,11 @@ def api_schedule_multi():
     result = get_multi_waste_schedule_for_selection(
         seniunija=seniunija, village=village, street=street_value, house_numbers=house_numbers
     )
-    return jsonify(result)
+    return ojsonify(result)
 
 
-@app.route("/api/v1/schedule-group/<schedule_group_id>", methods=["GET"])
+@api.route("/schedule-group/<schedule_group_id>", methods=["GET"])
+@cached_get("waste_type", "format")
 def api_schedule_group(schedule_group_id: str):
     """
     Get schedule for a schedule group (hash-based ID)
@@ -372,6 +622,12 @@ def api_schedule_group(schedule_group_id: str):
         required: false
         default: bendros
         description: Waste type (bendros, plastikas, stiklas, etc.)
+      - name: format
+        in: query
+        type: string
+        required: false
+        enum: [soa]
+        description: 'soa returns dates as parallel "date" and "waste_type" arrays (one object per date otherwise)'
     responses:
       200:
         description: Schedule group data
@@ -399,10 +655,14 @@ def api_schedule_group(schedule_group_id: str):
         calendar_id = schedule["metadata"]["calendar_id"]
         schedule["subscription_link"] = generate_calendar_subscription_link(calendar_id)
 
-    return jsonify(schedule)
+    if _wants_columnar():
+        schedule = _with_columnar_dates(schedule)
+
+    return ojsonify(schedule)
 
 
-@app.route("/api/v1/villages", methods=["GET"])
+@api.route("/villages", methods=["GET"])
+@cached_get()
 def api_villages():
     """
     Get list of unique villages with their seniunija
@@ -425,11 +685,42 @@ def api_villages():
                   village:
                     type: string
     """
-    villages = get_unique_villages()
-    return jsonify({"villages": villages})
+    return ojsonify({"villages": get_unique_villages()})
 
 
-@app.route("/api/v1/streets", methods=["GET"])
+@api.route("/hierarchy", methods=["GET"])
+@cached_get()
+def api_hierarchy():
+    """
+    Get the full seniunija / village / street / house number tree
+    ---
+    tags:
+      - Locations
+    description: |
+      Everything the village -> street -> house number pickers need, in one (cacheable) response.
+      Street "" means the whole village; an empty list means the street has no house numbers.
+    responses:
+      200:
+        description: "Nested object: {seniunija: {village: {street: [house_numbers]}}}"
+        schema:
+          type: object
+          properties:
+            hierarchy:
+              type: object
+              additionalProperties:
+                type: object
+                additionalProperties:
+                  type: object
+                  additionalProperties:
+                    type: array
+                    items:
+                      type: string
+    """
+    return ojsonify({"hierarchy": get_location_hierarchy()})
+
+
+@api.route("/streets", methods=["GET"])
+@cached_get("seniunija", "village")
 def api_streets():
     """
     Get list of streets for a village
@@ -469,18 +760,20 @@ def api_streets():
       400:
         description: Missing required parameters
     """
-    seniunija = request.args.get("seniunija", "")
-    village = request.args.get("village", "")
+    args = request.args
+    seniunija = args.get("seniunija", "")
+    village = args.get("village", "")
 
     if not seniunija or not village:
-        return jsonify({"error": "seniunija and village parameters required"}), 400
+        return ojsonify({"error": "seniunija and village parameters required"}, status=400)
 
     streets = get_streets_for_village(seniunija, village)
+    availability = get_available_waste_types_for_streets(
+        seniunija=seniunija, village=village, streets=streets
+    )
     enriched = []
     for street in streets:
-        avail = get_available_waste_types_for_selection(
-            seniunija=seniunija, village=village, street=street, house_numbers=None
-        )
+        avail = availability[street]
         enriched.append(
             {
                 "street": street,
@@ -488,10 +781,11 @@ def api_streets():
                 "bendros_requires_house_numbers": bool(avail.get("bendros_requires_house_numbers")),
             }
         )
-    return jsonify({"streets": enriched})
+    return ojsonify({"streets": enriched})
 
 
-@app.route("/api/v1/house-numbers", methods=["GET"])
+@api.route("/house-numbers", methods=["GET"])
+@cached_get("seniunija", "village", "street")
 def api_house_numbers():
     """
     Get list of house numbers for a street
@@ -534,12 +828,13 @@ def api_house_numbers():
       400:
         description: Missing required parameters
     """
-    seniunija = request.args.get("seniunija", "")
-    village = request.args.get("village", "")
-    street = request.args.get("street", "")
+    args = request.args
+    seniunija = args.get("seniunija", "")
+    village = args.get("village", "")
+    street = args.get("street", "")
 
     if not seniunija or not village:
-        return jsonify({"error": "seniunija and village parameters required"}), 400
+        return ojsonify({"error": "seniunija and village parameters required"}, status=400)
 
     # street can be empty string for whole village
     house_numbers = get_house_numbers_for_street(seniunija, village, street or "")
@@ -564,20 +859,21 @@ def api_house_numbers():
             if "bendros" in (street_level_avail.get("available_waste_types") or []):
                 avail.add("bendros")
         enriched.append({"house_numbers": "", "available_waste_types": sorted(avail)})
+    availability = get_available_waste_types_for_house_numbers(
+        seniunija=seniunija, village=village, street=street_value, house_numbers=house_numbers
+    )
     for bucket in house_numbers:
-        avail = get_available_waste_types_for_selection(
-            seniunija=seniunija, village=village, street=street or "", house_numbers=bucket
-        )
+        avail = availability[bucket]
         enriched.append(
             {
                 "house_numbers": bucket,
                 "available_waste_types": sorted(avail.get("available_waste_types") or []),
             }
         )
-    return jsonify({"house_numbers": enriched})
+    return ojsonify({"house_numbers": enriched})
 
 
-@app.route("/api/v1/available-calendars", methods=["GET"])
+@api.route("/available-calendars", methods=["GET"])
 def api_available_calendars():
     """
     List all available Google Calendars (GET - public)
@@ -609,10 +905,10 @@ def api_available_calendars():
         description: Invalid or missing API key
     """
     calendars = list_available_calendars()
-    return jsonify({"calendars": calendars})
+    return ojsonify({"calendars": calendars})
 
 
-@app.route("/api/v1/calendar-info/<calendar_id>", methods=["GET"])
+@api.route("/calendar-info/<calendar_id>", methods=["GET"])
 def api_calendar_info(calendar_id: str):
     """
     Get information about a specific calendar (GET - public)
@@ -648,11 +944,15 @@ def api_calendar_info(calendar_id: str):
     """
     calendar_info = get_existing_calendar_info(calendar_id)
     if not calendar_info:
-        return jsonify({"error": "Calendar not found"}), 404
+        return ojsonify({"error": "Calendar not found"}, status=404)
+
+    return ojsonify(calendar_info)
+
 
-    return jsonify(calendar_info)
+app.register_blueprint(api)
 
 
 if __name__ == "__main__":
+    validate_config(require_ai=False)
     logger.info("Starting API server on 0.0.0.0:3333")
     app.run(host="0.0.0.0", port=3333, debug=config.DEBUG)
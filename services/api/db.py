@@ -3,15 +3,100 @@ Database query functions for API
 Updated for new schema: hash-based schedule_groups, dates in JSON, no pickup_dates table
 """
 
-import json
 import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from functools import lru_cache, wraps
+from operator import itemgetter
+from typing import Any, TypeVar
 
+from services.common.db import get_data_version as _get_data_version
 from services.common.db import get_db_connection
 from services.common.db_helpers import (
     get_calendar_status,
-    get_schedule_group_info,
+    parse_dates_json,
+    schedule_group_info_from_row,
 )
 
+_local = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Return this thread's API connection, opening it on first use.
+
+    Connections are reused across helpers and requests instead of reconnecting per query. Each
+    one remembers the `get_db_connection` factory it came from, so swapping the factory (tests
+    point it at a temporary database) transparently reconnects.
+    """
+    factory = get_db_connection
+    conn: sqlite3.Connection | None = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "factory", None) is not factory:
+        if conn is not None:
+            conn.close()
+        conn = factory()
+        # Rows can be indexed by position (existing helpers) or turned into dicts with dict(row)
+        # when the selected column names already match the response keys.
+        conn.row_factory = sqlite3.Row
+        # Long-lived connection: a 64 MiB page cache (plus memory-mapped reads) keeps the hot
+        # tables in memory between requests, and sqlite3's per-connection statement cache reuses
+        # prepared statements for the (constant) SQL text of every helper below.
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        # The API only reads; refuse writes on this connection outright.
+        conn.execute("PRAGMA query_only = ON")
+        _local.conn = conn
+        _local.factory = factory
+    return conn
+
+
+# PRAGMA data_version catches commits the file stats can miss (e.g. a checkpoint leaving the same
+# mtime/size), but its value is only comparable on one connection. Every thread reads it from this
+# one shared connection, so they all agree on the token however old their own connection is.
+_version_conn: sqlite3.Connection | None = None
+_version_factory: Callable[[], sqlite3.Connection] | None = None
+_version_lock = threading.Lock()
+
+
+def get_data_version() -> str:
+    """Change token for the API database; differs after any committed write."""
+    global _version_conn, _version_factory
+    factory = get_db_connection
+    with _version_lock:
+        if _version_conn is None or _version_factory is not factory:
+            if _version_conn is not None:
+                _version_conn.close()
+            _version_conn = factory()
+            _version_conn.execute("PRAGMA query_only = ON")
+            _version_factory = factory
+        commits = _version_conn.execute("PRAGMA data_version").fetchone()[0]
+        return f"{_get_data_version(_version_conn)}|{commits}"
+
+
+_T = TypeVar("_T")
+
+
+def _memoize_until_data_changes(func: Callable[..., _T]) -> Callable[..., _T]:
+    """
+    Memoize a read-only lookup on its (positional) arguments plus the current data version.
+
+    Entries from an older data version are never hit again and age out of the LRU. Lists are
+    stored as tuples and copied on the way out so callers can't mutate the cached value.
+    """
+
+    @lru_cache(maxsize=4096)
+    def cached(data_version: str, *args: Any) -> Any:
+        result = func(*args)
+        return tuple(result) if isinstance(result, list) else result
+
+    @wraps(func)
+    def wrapper(*args: Any) -> Any:
+        result = cached(get_data_version(), *args)
+        return list(result) if isinstance(result, tuple) else result
+
+    return wrapper
+
 
 def get_all_locations() -> list[dict]:
     """
@@ -20,7 +105,16 @@ def get_all_locations() -> list[dict]:
     Returns:
         List of dictionaries with id, village, street, kaimai_hash
     """
-    conn = get_db_connection()
+    return list(iter_all_locations())
+
+
+def iter_all_locations() -> Iterator[dict]:
+    """
+    Yield all locations one at a time straight from the cursor (same dicts as get_all_locations)
+
+    Lets callers stream large responses without holding every row in memory.
+    """
+    conn = _get_conn()
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -29,21 +123,8 @@ def get_all_locations() -> list[dict]:
         ORDER BY seniunija, village, street
     """)
 
-    results = []
-    for row in cursor.fetchall():
-        results.append(
-            {
-                "id": row[0],
-                "seniunija": row[1],
-                "village": row[2],
-                "street": row[3],
-                "house_numbers": row[4],
-                "kaimai_hash": row[5],
-            }
-        )
-
-    conn.close()
-    return results
+    for row in cursor:
+        yield dict(row)
 
 
 def get_location_schedule(
@@ -66,55 +147,55 @@ def get_location_schedule(
     Returns:
         Dictionary with location info and dates, or None if not found
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     # Build query based on provided parameters
     if location_id:
-        cursor.execute(
-            """
-            SELECT id, seniunija, village, street, house_numbers, kaimai_hash
-            FROM locations
-            WHERE id = ?
-        """,
-            (location_id,),
-        )
+        where = "l.id = ?"
+        params: tuple = (location_id,)
     elif seniunija and village and street is not None:
-        cursor.execute(
-            """
-            SELECT id, seniunija, village, street, house_numbers, kaimai_hash
-            FROM locations
-            WHERE seniunija = ? AND village = ? AND street = ?
-        """,
-            (seniunija, village, street),
-        )
+        where = "l.seniunija = ? AND l.village = ? AND l.street = ?"
+        params = (seniunija, village, street)
     else:
-        conn.close()
-        return None
-
-    location_row = cursor.fetchone()
-    if not location_row:
-        conn.close()
         return None
 
-    location_id = location_row[0]
-    kaimai_hash = location_row[5]
+    conn = _get_conn()
+    cursor = conn.cursor()
 
-    # Get dates from schedule_groups and calendar info via calendar streams
+    # Location, its schedule group (UNIQUE(kaimai_hash, waste_type)) and calendar in one lookup
     cursor.execute(
-        """
-        SELECT sg.id, sg.dates, cs.calendar_id, cs.calendar_synced_at
-        FROM schedule_groups sg
+        f"""
+        SELECT l.id, l.seniunija, l.village, l.street, l.house_numbers, l.kaimai_hash,
+               sg.id, sg.dates, cs.calendar_id, cs.calendar_synced_at
+        FROM locations l
+        LEFT JOIN schedule_groups sg ON sg.kaimai_hash = l.kaimai_hash AND sg.waste_type = ?
         LEFT JOIN group_calendar_links gcl ON gcl.schedule_group_id = sg.id
         LEFT JOIN calendar_streams cs ON cs.id = gcl.calendar_stream_id
-        WHERE sg.kaimai_hash = ?
-          AND sg.waste_type = ?
+        WHERE {where}
         LIMIT 1
     """,
-        (kaimai_hash, waste_type),
+        (waste_type, *params),
     )
 
-    schedule_row = cursor.fetchone()
+    row = cursor.fetchone()
+    if not row:
+        return None
+
+    location_row = row[:6]
+    schedule_row = row[6:10] if row[6] is not None else None
+
+    return _build_location_schedule(location_row, schedule_row, waste_type)
+
+
+def _build_location_schedule(
+    location_row: tuple, schedule_row: tuple | None, waste_type: str
+) -> dict:
+    """
+    Build the location schedule response dict
+
+    Args:
+        location_row: (id, seniunija, village, street, house_numbers, kaimai_hash)
+        schedule_row: (schedule_group_id, dates_json, calendar_id, calendar_synced_at) or None
+        waste_type: Waste type the schedule was looked up for
+    """
     dates = []
     schedule_group_id = None
     calendar_id = None
@@ -125,11 +206,7 @@ def get_location_schedule(
         dates_json = schedule_row[1]
         calendar_id = schedule_row[2]
         calendar_synced_at = schedule_row[3]
-        if dates_json:
-            date_list = json.loads(dates_json)
-            dates = [{"date": d, "waste_type": waste_type} for d in date_list]
-
-    conn.close()
+        dates = [{"date": d, "waste_type": waste_type} for d in parse_dates_json(dates_json)]
 
     result = {
         "id": location_row[0],
@@ -167,13 +244,34 @@ def get_schedule_group_schedule(schedule_group_id: str, waste_type: str = "bendr
     Returns:
         Dictionary with schedule group info, locations, and dates
     """
-    conn = get_db_connection()
+    conn = _get_conn()
     cursor = conn.cursor()
 
-    # Get schedule group metadata
-    group_info = get_schedule_group_info(schedule_group_id)
-    if not group_info:
-        conn.close()
+    # One round-trip: the group row (kind 0, with its calendar via calendar streams) followed by
+    # its locations (kind 1, matched on kaimai_hash). The locations branch only returns rows when
+    # the waste type matches. A compound SELECT orders by result position: 3, 4, 5 are the
+    # locations' seniunija, village, street.
+    cursor.execute(
+        """
+        SELECT 0 AS kind, sg.id, sg.waste_type, sg.kaimai_hash, sg.first_date, sg.last_date,
+               sg.date_count, sg.dates, sg.dates_hash, sg.calendar_id, sg.calendar_synced_at,
+               sg.created_at, sg.updated_at, cs.calendar_id
+        FROM schedule_groups sg
+        LEFT JOIN group_calendar_links gcl ON gcl.schedule_group_id = sg.id
+        LEFT JOIN calendar_streams cs ON cs.id = gcl.calendar_stream_id
+        WHERE sg.id = :schedule_group_id
+        UNION ALL
+        SELECT 1, l.id, l.seniunija, l.village, l.street, l.house_numbers,
+               NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL
+        FROM schedule_groups sg
+        JOIN locations l ON l.kaimai_hash = sg.kaimai_hash
+        WHERE sg.id = :schedule_group_id AND sg.waste_type = :waste_type
+        ORDER BY 1, 3, 4, 5
+    """,
+        {"schedule_group_id": schedule_group_id, "waste_type": waste_type},
+    )
+    rows = cursor.fetchall()
+    if not rows or rows[0][0] != 0:
         return {
             "schedule_group_id": schedule_group_id,
             "error": "Schedule group not found",
@@ -181,9 +279,12 @@ def get_schedule_group_schedule(schedule_group_id: str, waste_type: str = "bendr
             "dates": [],
         }
 
+    group_row = rows[0]
+    group_info = schedule_group_info_from_row(group_row[1:13])
+    calendar_id = group_row[13]
+
     # Filter by waste_type if provided
     if group_info["waste_type"] != waste_type:
-        conn.close()
         return {
             "schedule_group_id": schedule_group_id,
             "error": f'Schedule group is for waste_type "{group_info["waste_type"]}", not "{waste_type}"',
@@ -191,10 +292,7 @@ def get_schedule_group_schedule(schedule_group_id: str, waste_type: str = "bendr
             "dates": [],
         }
 
-    # Get all locations in this group (by matching kaimai_hash directly)
-    kaimai_hash = group_info["kaimai_hash"]
-    if not kaimai_hash:
-        conn.close()
+    if not group_info["kaimai_hash"]:
         return {
             "schedule_group_id": schedule_group_id,
             "metadata": group_info,
@@ -203,48 +301,20 @@ def get_schedule_group_schedule(schedule_group_id: str, waste_type: str = "bendr
             "dates": group_info["dates"],
         }
 
-    # Direct lookup by kaimai_hash (single value, not JSON array)
-    cursor.execute(
-        """
-        SELECT id, seniunija, village, street, house_numbers
-        FROM locations
-        WHERE kaimai_hash = ?
-        ORDER BY seniunija, village, street
-    """,
-        (kaimai_hash,),
-    )
-
-    locations = []
-    for row in cursor.fetchall():
-        locations.append(
-            {
-                "id": row[0],
-                "seniunija": row[1],
-                "village": row[2],
-                "street": row[3],
-                "house_numbers": row[4],
-            }
-        )
+    locations = [
+        {
+            "id": row[1],
+            "seniunija": row[2],
+            "village": row[3],
+            "street": row[4],
+            "house_numbers": row[5],
+        }
+        for row in rows[1:]
+    ]
 
     # Dates are already in group_info
     dates = [{"date": d, "waste_type": waste_type} for d in group_info["dates"]]
 
-    # Calendar info comes from calendar_streams
-    cursor.execute(
-        """
-        SELECT cs.calendar_id, cs.calendar_synced_at
-        FROM group_calendar_links gcl
-        JOIN calendar_streams cs ON cs.id = gcl.calendar_stream_id
-        WHERE gcl.schedule_group_id = ?
-        LIMIT 1
-    """,
-        (schedule_group_id,),
-    )
-    calendar_row = cursor.fetchone()
-    calendar_id = calendar_row[0] if calendar_row else None
-
-    conn.close()
-
     return {
         "schedule_group_id": schedule_group_id,
         "metadata": {
@@ -260,51 +330,93 @@ def get_schedule_group_schedule(schedule_group_id: str, waste_type: str = "bendr
     }
 
 
+def _fts_prefix_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must match as a (quoted) prefix"""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+@_memoize_until_data_changes
 def search_locations(query: str) -> list[dict]:
     """
-    Search locations by village or street name
+    Search locations by seniunija, village or street name
+
+    Uses the locations_fts index (prefix match per word, case/diacritic-insensitive).
 
     Args:
         query: Search query
 
     Returns:
-        List of matching locations
+        List of matching locations, best matches first
     """
-    conn = get_db_connection()
+    match = _fts_prefix_query(query)
+    if not match:
+        return []
+
+    conn = _get_conn()
     cursor = conn.cursor()
 
-    search_term = f"%{query}%"
     cursor.execute(
         """
-        SELECT id, seniunija, village, street, house_numbers, kaimai_hash
-        FROM locations
-        WHERE seniunija LIKE ? OR village LIKE ? OR street LIKE ?
-        ORDER BY seniunija, village, street
+        SELECT l.id, l.seniunija, l.village, l.street, l.house_numbers, l.kaimai_hash
+        FROM locations_fts f
+        JOIN locations l ON l.id = f.rowid
+        WHERE locations_fts MATCH ?
+        ORDER BY f.rank, l.seniunija, l.village, l.street
         LIMIT 50
     """,
-        (search_term, search_term, search_term),
+        (match,),
     )
 
-    results = []
-    for row in cursor.fetchall():
-        results.append(
-            {
-                "id": row[0],
-                "seniunija": row[1],
-                "village": row[2],
-                "street": row[3],
-                "house_numbers": row[4],
-                "kaimai_hash": row[5],
-            }
-        )
+    return [dict(row) for row in cursor]
 
-    conn.close()
-    return results
+
+def get_location_hierarchy() -> dict[str, dict[str, dict[str, list[str]]]]:
+    """
+    Get the whole seniunija -> village -> street -> house numbers tree
+
+    Street '' stands for the whole village; NULL house numbers are left out of the lists
+    (same as get_house_numbers_for_street). The tree is shared between callers (it is also the
+    index behind the street/house-number helpers below), so it must not be mutated.
+
+    Returns:
+        Nested dict {seniunija: {village: {street: [house_numbers, ...]}}}
+    """
+    return _location_tree()
+
+
+@_memoize_until_data_changes
+def _location_tree() -> dict[str, dict[str, dict[str, list[str]]]]:
+    """Build the location tree in one query; rebuilt only when the data version changes"""
+    conn = _get_conn()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT DISTINCT seniunija, village, street, house_numbers, house_numbers_sort_key
+        FROM locations
+        ORDER BY seniunija, village, CASE WHEN street = '' THEN 0 ELSE 1 END, street,
+                 house_numbers_sort_key, house_numbers
+    """)
+
+    hierarchy: dict[str, dict[str, dict[str, list[str]]]] = {}
+    for seniunija, village, street, house_numbers, _sort_key in cursor:
+        streets = hierarchy.setdefault(seniunija, {}).setdefault(village, {})
+        house_list = streets.setdefault(street or "", [])
+        if house_numbers is not None:
+            house_list.append(house_numbers)
+
+    return hierarchy
+
+
+def _village_streets(seniunija: str, village: str) -> dict[str, list[str]]:
+    """The {street: [house_numbers]} branch of the location tree for one village"""
+    return _location_tree().get(seniunija, {}).get(village, {})
 
 
+@_memoize_until_data_changes
 def get_unique_villages() -> list[dict]:
     """Get list of unique villages with seniunija and village as separate keys"""
-    conn = get_db_connection()
+    conn = _get_conn()
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -314,7 +426,7 @@ def get_unique_villages() -> list[dict]:
         ORDER BY seniunija, village
     """)
 
-    results = [{"seniunija": row[0], "village": row[1]} for row in cursor.fetchall()]
+    results = [dict(row) for row in cursor]
 
     # Enrich villages with aggregated waste-type availability so the UI can render chips already at
     # the "Kaimas/Miestas" level.
@@ -325,7 +437,7 @@ def get_unique_villages() -> list[dict]:
     # - scope "none": not present
     bendros_scope: dict[tuple[str, str], str] = {}
     try:
-        rows = cursor.execute(
+        cursor.execute(
             """
             SELECT
               l.seniunija,
@@ -338,8 +450,8 @@ def get_unique_villages() -> list[dict]:
             WHERE l.village != ''
             GROUP BY l.seniunija, l.village
             """
-        ).fetchall()
-        for s, v, has_villagewide in rows:
+        )
+        for s, v, has_villagewide in cursor:
             bendros_scope[(s, v)] = "all" if (has_villagewide or 0) == 1 else "some"
     except sqlite3.OperationalError:
         # Minimal DBs might not include schedule_groups yet.
@@ -347,7 +459,7 @@ def get_unique_villages() -> list[dict]:
 
     pdf_scope: dict[tuple[str, str, str], str] = {}
     try:
-        rows = cursor.execute(
+        cursor.execute(
             """
             SELECT
               COALESCE(mapped_seniunija, seniunija) as s,
@@ -364,8 +476,8 @@ def get_unique_villages() -> list[dict]:
               AND COALESCE(mapped_village, village) != ''
             GROUP BY s, v, waste_type
             """
-        ).fetchall()
-        for s, v, wt, has_villagewide in rows:
+        )
+        for s, v, wt, has_villagewide in cursor:
             pdf_scope[(s, v, wt)] = "all" if (has_villagewide or 0) == 1 else "some"
     except sqlite3.OperationalError as e:
         # Test DBs / minimal deployments may not include PDF tables.
@@ -384,134 +496,110 @@ def get_unique_villages() -> list[dict]:
             [wt for wt, scope in scopes.items() if scope != "none"]
         )
 
-    conn.close()
     return results
 
 
+# The dropdown helpers below are dict lookups into the memoized location tree (one query per
+# data version) instead of a query per village/street.
 def get_streets_for_village(seniunija: str, village: str) -> list[str]:
     """Get list of unique streets for a village in a specific seniunija (includes empty string for whole village)"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT DISTINCT street
-        FROM locations
-        WHERE seniunija = ? AND village = ?
-        ORDER BY CASE WHEN street = '' THEN 0 ELSE 1 END, street
-    """,
-        (seniunija, village),
-    )
-
-    results = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return list(_village_streets(seniunija, village))
 
 
 def get_house_numbers_for_street(seniunija: str, village: str, street: str) -> list[str]:
     """Get list of unique house numbers for a street in a specific seniunija/village (street can be empty string for whole village)"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT DISTINCT house_numbers
-        FROM locations
-        WHERE seniunija = ? AND village = ? AND street = ?
-        ORDER BY house_numbers
-    """,
-        (seniunija, village, street),
-    )
-
-    # Filter out None values, but keep empty strings if they exist
-    results = [row[0] for row in cursor.fetchall() if row[0] is not None]
-    conn.close()
-    return results
+    return list(_village_streets(seniunija, village).get(street, ()))
 
 
 def village_has_streets(seniunija: str, village: str) -> bool:
     """Check if a village in a specific seniunija has any non-empty streets"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT COUNT(*)
-        FROM locations
-        WHERE seniunija = ? AND village = ? AND street != '' AND street IS NOT NULL
-        LIMIT 1
-    """,
-        (seniunija, village),
-    )
-
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count > 0
+    return any(_village_streets(seniunija, village))
 
 
 def street_has_house_numbers(seniunija: str, village: str, street: str) -> bool:
     """Check if a street in a specific seniunija/village has any house numbers"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    return any(_village_streets(seniunija, village).get(street, ()))
 
-    cursor.execute(
-        """
-        SELECT COUNT(*)
-        FROM locations
-        WHERE seniunija = ? AND village = ? AND street = ? AND house_numbers IS NOT NULL AND house_numbers != ''
-        LIMIT 1
-    """,
-        (seniunija, village, street),
-    )
 
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count > 0
+def resolve_schedule(
+    seniunija: str,
+    village: str,
+    street: str | None,
+    house_numbers: str | None,
+    waste_type: str = "bendros",
+) -> dict:
+    """
+    Resolve a seniunija/village/street/house selection to its schedule in one query
 
+    Combines village_has_streets, street_has_house_numbers, the location lookup and
+    get_location_schedule so /api/v1/schedule needs a single DB round-trip. The street is
+    ignored (treated as '') when the village has no streets, matching the endpoint rules.
 
-def get_location_by_selection(
-    seniunija: str, village: str, street: str, house_numbers: str | None = None
-) -> dict | None:
-    """Get location by seniunija, village, street, and optionally house_numbers"""
-    conn = get_db_connection()
+    Returns:
+        Dictionary with has_streets, has_house_numbers and schedule (None if no location)
+    """
+    conn = _get_conn()
     cursor = conn.cursor()
 
-    if house_numbers:
-        cursor.execute(
-            """
-            SELECT id, seniunija, village, street, house_numbers, kaimai_hash
-            FROM locations
-            WHERE seniunija = ? AND village = ? AND street = ? AND house_numbers = ?
-            LIMIT 1
-        """,
-            (seniunija, village, street, house_numbers),
-        )
-    else:
-        # If no house_numbers specified, get first match (or one with NULL house_numbers)
-        cursor.execute(
-            """
-            SELECT id, seniunija, village, street, house_numbers, kaimai_hash
-            FROM locations
-            WHERE seniunija = ? AND village = ? AND street = ?
-            ORDER BY CASE WHEN house_numbers IS NULL THEN 0 ELSE 1 END
+    cursor.execute(
+        """
+        WITH flags AS (
+            SELECT EXISTS(
+                SELECT 1 FROM locations
+                WHERE seniunija = :seniunija AND village = :village
+                  AND street != '' AND street IS NOT NULL
+            ) AS has_streets
+        ),
+        sel AS (
+            SELECT CASE WHEN has_streets THEN :street ELSE '' END AS street FROM flags
+        ),
+        hn AS (
+            SELECT EXISTS(
+                SELECT 1 FROM locations l, sel
+                WHERE l.seniunija = :seniunija AND l.village = :village AND l.street = sel.street
+                  AND l.house_numbers IS NOT NULL AND l.house_numbers != ''
+            ) AS has_house_numbers
+        ),
+        loc AS (
+            SELECT l.id, l.seniunija, l.village, l.street, l.house_numbers, l.kaimai_hash
+            FROM locations l, sel
+            WHERE l.seniunija = :seniunija AND l.village = :village AND l.street = sel.street
+              AND (COALESCE(:house_numbers, '') = '' OR l.house_numbers = :house_numbers)
+            ORDER BY CASE WHEN l.house_numbers IS NULL THEN 0 ELSE 1 END
             LIMIT 1
-        """,
-            (seniunija, village, street),
         )
+        SELECT flags.has_streets, hn.has_house_numbers,
+               loc.id, loc.seniunija, loc.village, loc.street, loc.house_numbers, loc.kaimai_hash,
+               sg.id, sg.dates, cs.calendar_id, cs.calendar_synced_at
+        FROM flags
+        CROSS JOIN hn
+        LEFT JOIN loc ON 1
+        LEFT JOIN schedule_groups sg
+          ON sg.kaimai_hash = loc.kaimai_hash AND sg.waste_type = :waste_type
+        LEFT JOIN group_calendar_links gcl ON gcl.schedule_group_id = sg.id
+        LEFT JOIN calendar_streams cs ON cs.id = gcl.calendar_stream_id
+        LIMIT 1
+    """,
+        {
+            "seniunija": seniunija,
+            "village": village,
+            "street": street,
+            "house_numbers": house_numbers,
+            "waste_type": waste_type,
+        },
+    )
 
     row = cursor.fetchone()
-    conn.close()
 
-    if not row:
-        return None
+    schedule = None
+    if row[2] is not None:
+        schedule_row = row[8:12] if row[8] is not None else None
+        schedule = _build_location_schedule(row[2:8], schedule_row, waste_type)
 
     return {
-        "id": row[0],
-        "seniunija": row[1],
-        "village": row[2],
-        "street": row[3],
-        "house_numbers": row[4],
-        "kaimai_hash": row[5],
+        "has_streets": bool(row[0]),
+        "has_house_numbers": bool(row[1]),
+        "schedule": schedule,
     }
 
 
@@ -531,7 +619,7 @@ def get_available_waste_types_for_selection(
     This is intentionally conservative: it does not try to "contain" user-entered house numbers.
     It only matches exact house-number buckets or the street-level (house_numbers is None).
     """
-    conn = get_db_connection()
+    conn = _get_conn()
     cursor = conn.cursor()
 
     bendros_requires_house_numbers = street_has_house_numbers(seniunija, village, street)
@@ -637,13 +725,148 @@ def get_available_waste_types_for_selection(
         if "no such table: pdf_parsed_rows" not in str(e):
             raise
 
-    conn.close()
     return {
         "available_waste_types": sorted(available),
         "bendros_requires_house_numbers": bendros_requires_house_numbers,
     }
 
 
+def get_available_waste_types_for_streets(
+    *,
+    seniunija: str,
+    village: str,
+    streets: list[str],
+) -> dict[str, dict]:
+    """
+    get_available_waste_types_for_selection(street=..., house_numbers=None) for many streets at
+    once: two queries for the whole village instead of two per street.
+
+    Returns:
+        {street: {"available_waste_types": [...], "bendros_requires_house_numbers": bool}}
+    """
+    conn = _get_conn()
+    cursor = conn.cursor()
+
+    bendros_streets = {
+        row[0]
+        for row in cursor.execute(
+            """
+            SELECT DISTINCT l.street
+            FROM locations l
+            JOIN schedule_groups sg ON sg.kaimai_hash = l.kaimai_hash
+            WHERE l.seniunija = ? AND l.village = ? AND sg.waste_type = 'bendros'
+            """,
+            (seniunija, village),
+        )
+    }
+
+    # Street-level selections inherit village-wide PDF rows (street '')
+    pdf_types: dict[str, set[str]] = {}
+    try:
+        rows = cursor.execute(
+            """
+            SELECT DISTINCT COALESCE(COALESCE(mapped_street, street), ''), waste_type
+            FROM pdf_parsed_rows
+            WHERE COALESCE(mapped_seniunija, seniunija) = ?
+              AND COALESCE(mapped_village, village) = ?
+              AND waste_type IN ('plastikas', 'stiklas')
+            """,
+            (seniunija, village),
+        ).fetchall()
+        for pdf_street, waste_type in rows:
+            pdf_types.setdefault(pdf_street, set()).add(waste_type)
+    except sqlite3.OperationalError as e:
+        # Test DBs / minimal deployments may not include PDF tables.
+        if "no such table: pdf_parsed_rows" not in str(e):
+            raise
+
+    village_wide = pdf_types.get("", set())
+    # One tree lookup for the village instead of a street_has_house_numbers call per street
+    village_streets = _village_streets(seniunija, village)
+    result = {}
+    for street in streets:
+        available = village_wide | pdf_types.get(street, set())
+        if street in bendros_streets:
+            available.add("bendros")
+        result[street] = {
+            "available_waste_types": sorted(available),
+            "bendros_requires_house_numbers": any(village_streets.get(street, ())),
+        }
+    return result
+
+
+def get_available_waste_types_for_house_numbers(
+    *,
+    seniunija: str,
+    village: str,
+    street: str,
+    house_numbers: list[str],
+) -> dict[str, dict]:
+    """
+    get_available_waste_types_for_selection(house_numbers=...) for every bucket of a street at
+    once: two queries instead of two per bucket.
+
+    Returns:
+        {bucket: {"available_waste_types": [...], "bendros_requires_house_numbers": bool}}
+    """
+    conn = _get_conn()
+    cursor = conn.cursor()
+
+    bendros_buckets = {
+        row[0]
+        for row in cursor.execute(
+            """
+            SELECT DISTINCT l.house_numbers
+            FROM locations l
+            JOIN schedule_groups sg ON sg.kaimai_hash = l.kaimai_hash
+            WHERE l.seniunija = ? AND l.village = ? AND l.street = ?
+              AND sg.waste_type = 'bendros'
+            """,
+            (seniunija, village, street),
+        )
+    }
+
+    # Buckets inherit street-wide PDF rows (house_numbers NULL/''/'all'); the street itself
+    # inherits village-wide rows (street '')
+    pdf_types: dict[str, set[str]] = {}
+    streetwide: set[str] = set()
+    try:
+        rows = cursor.execute(
+            """
+            SELECT DISTINCT COALESCE(house_numbers, ''), waste_type
+            FROM pdf_parsed_rows
+            WHERE COALESCE(mapped_seniunija, seniunija) = :seniunija
+              AND COALESCE(mapped_village, village) = :village
+              AND (
+                COALESCE(COALESCE(mapped_street, street), '') = :street
+                OR COALESCE(COALESCE(mapped_street, street), '') = ''
+              )
+              AND waste_type IN ('plastikas', 'stiklas')
+            """,
+            {"seniunija": seniunija, "village": village, "street": street},
+        ).fetchall()
+        for pdf_house_numbers, waste_type in rows:
+            if pdf_house_numbers.lower() in ("", "all"):
+                streetwide.add(waste_type)
+            else:
+                pdf_types.setdefault(pdf_house_numbers, set()).add(waste_type)
+    except sqlite3.OperationalError as e:
+        if "no such table: pdf_parsed_rows" not in str(e):
+            raise
+
+    bendros_requires_house_numbers = street_has_house_numbers(seniunija, village, street)
+    result = {}
+    for bucket in house_numbers:
+        available = streetwide | pdf_types.get(bucket, set())
+        if bucket in bendros_buckets:
+            available.add("bendros")
+        result[bucket] = {
+            "available_waste_types": sorted(available),
+            "bendros_requires_house_numbers": bendros_requires_house_numbers,
+        }
+    return result
+
+
 def get_pdf_streetwide_waste_types_for_selection(
     *,
     seniunija: str,
@@ -657,7 +880,7 @@ def get_pdf_streetwide_waste_types_for_selection(
     is bucket-split: if plastikas/stiklas is street-wide, 'Visiems' still makes sense for those
     waste types even though bendros needs a bucket.
     """
-    conn = get_db_connection()
+    conn = _get_conn()
     cursor = conn.cursor()
     types: set[str] = set()
     try:
@@ -678,8 +901,6 @@ def get_pdf_streetwide_waste_types_for_selection(
     except sqlite3.OperationalError as e:
         if "no such table: pdf_parsed_rows" not in str(e):
             raise
-    finally:
-        conn.close()
     return types
 
 
@@ -798,8 +1019,7 @@ def _get_schedule_for_kaimai_hash(
     dates_json = row[1]
     calendar_id = row[2]
     calendar_synced_at = row[3]
-    date_list = json.loads(dates_json) if dates_json else []
-    dates = [{"date": d, "waste_type": waste_type} for d in date_list]
+    dates = [{"date": d, "waste_type": waste_type} for d in parse_dates_json(dates_json)]
 
     result = {
         "schedule_group_id": schedule_group_id,
@@ -830,7 +1050,7 @@ def get_multi_waste_schedule_for_selection(
     - plastikas/stiklas are resolved via pdf_parsed_rows -> kaimai_hash -> schedule_groups.
     - If bendros requires buckets, and house_numbers is None, bendros schedule may be omitted.
     """
-    conn = get_db_connection()
+    conn = _get_conn()
     cursor = conn.cursor()
 
     availability = get_available_waste_types_for_selection(
@@ -844,11 +1064,10 @@ def get_multi_waste_schedule_for_selection(
     # bendros schedule (only when resolvable)
     if "bendros" in available_waste_types:
         if (not bendros_requires_house_numbers) or (house_numbers is not None):
-            location = get_location_by_selection(seniunija, village, street, house_numbers)
-            if location:
-                sched = get_location_schedule(location_id=location["id"], waste_type="bendros")
-                if sched:
-                    schedules["bendros"] = sched
+            # Location + schedule group + calendar in one round-trip (same query as /schedule)
+            sched = resolve_schedule(seniunija, village, street, house_numbers)["schedule"]
+            if sched:
+                schedules["bendros"] = sched
 
     # plastikas/stiklas schedules via pdf_parsed_rows kaimai_hash mapping
     for wt in ("plastikas", "stiklas"):
@@ -868,22 +1087,17 @@ def get_multi_waste_schedule_for_selection(
         if sched:
             schedules[wt] = sched
 
-    # Flatten combined dates
-    combined_dates: list[dict[str, str]] = []
-    for wt, sched in schedules.items():
-        for d in sched.get("dates") or []:
-            # d already has waste_type for schedule_group-based schedules; for bendros it does too
-            combined_dates.append(
-                {"date": str(d["date"]), "waste_type": str(d.get("waste_type", wt))}
-            )
-
-    # Sort by date then waste_type for stable UI
-    def _combined_date_sort_key(item: dict[str, str]) -> tuple[str, str]:
-        return (item["date"], item.get("waste_type", ""))
-
-    combined_dates.sort(key=_combined_date_sort_key)
+    # Flatten combined dates, sorted by date then waste_type for stable UI.
+    # d already has waste_type for schedule_group-based schedules; for bendros it does too
+    combined_dates = sorted(
+        (
+            {"date": str(d["date"]), "waste_type": str(d.get("waste_type", wt))}
+            for wt, sched in schedules.items()
+            for d in sched.get("dates") or []
+        ),
+        key=itemgetter("date", "waste_type"),
+    )
 
-    conn.close()
     return {
         "selection": {
             "seniunija": seniunija,
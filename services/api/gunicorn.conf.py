@@ -0,0 +1,18 @@
+"""
+gunicorn settings for the web-api container
+
+    gunicorn -c services/api/gunicorn.conf.py services.api.wsgi:app
+
+Threaded workers: SQLite calls block in C and release the GIL, so OS threads (not gevent
+greenlets) give the concurrency. Counts can be overridden with WEB_CONCURRENCY / API_THREADS.
+"""
+
+import os
+
+bind = os.getenv("API_BIND", "0.0.0.0:3333")
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("API_THREADS", "8"))
+# Keep-alive lets browsers reuse the connection for the follow-up dropdown/schedule requests
+keepalive = 5
+accesslog = "-"
@@ -0,0 +1,14 @@
+"""
+WSGI entry point for production servers (gunicorn)
+
+    gunicorn -c services/api/gunicorn.conf.py services.api.wsgi:app
+
+`python services/api/app.py` still runs the Flask development server for local work.
+"""
+
+from services.api.app import app
+from services.common.config_utils import validate_config
+
+validate_config(require_ai=False)
+
+__all__ = ["app"]
@@ -11,6 +11,7 @@ import logging
 # Import configuration
 import sys
 import time
+from contextlib import closing
 from pathlib import Path
 
 from googleapiclient.errors import HttpError
@@ -120,15 +121,16 @@ def delete_calendar_for_stream(calendar_stream_id: str) -> None:
         conn.close()
         return
 
+    # Existence check: stops at the first linked group instead of counting them all
     cursor.execute(
         """
-        SELECT COUNT(*) FROM group_calendar_links
+        SELECT 1 FROM group_calendar_links
         WHERE calendar_stream_id = ?
+        LIMIT 1
     """,
         (calendar_stream_id,),
     )
-    linked_count = cursor.fetchone()[0]
-    if linked_count > 0:
+    if cursor.fetchone() is not None:
         conn.close()
         return
 
@@ -494,6 +496,79 @@ def sync_calendar_for_schedule_group(schedule_group_id: str) -> dict:
     return sync_calendar_for_calendar_stream(calendar_stream_id)
 
 
+# Google accepts at most 50 calls in one batch HTTP request.
+_EVENT_BATCH_SIZE = 50
+
+
+def _build_collection_event(date_str: str, waste_type_display: str) -> dict:
+    """
+    Build the Google Calendar event body for one collection date (YYYY-MM-DD).
+    """
+    # date.fromisoformat is C-implemented and still rejects malformed dates; the wall-clock
+    # times are plain strings instead of two datetime objects per event.
+    day = datetime.date.fromisoformat(date_str).isoformat()
+    return {
+        "summary": waste_type_display,
+        "description": "Išvežkite bendrų šiukšlių dėžę",
+        "start": {
+            "dateTime": f"{day}T{config.GOOGLE_CALENDAR_EVENT_START_HOUR:02d}:00:00",
+            "timeZone": config.GOOGLE_CALENDAR_TIMEZONE,
+        },
+        "end": {
+            "dateTime": f"{day}T{config.GOOGLE_CALENDAR_EVENT_END_HOUR:02d}:00:00",
+            "timeZone": config.GOOGLE_CALENDAR_TIMEZONE,
+        },
+        "reminders": {
+            "useDefault": False,
+            "overrides": config.GOOGLE_CALENDAR_REMINDERS,
+        },
+    }
+
+
+def _insert_events_batch(
+    service, calendar_id: str, dates: list[str], waste_type_display: str
+) -> dict[str, tuple[str | None, Exception | None]]:
+    """
+    Insert one event per date using a single batch HTTP request.
+
+    Returns {date: (event_id, error)}. Each event succeeds or fails on its own; if the batch call
+    itself fails, every date without a response gets that error. A date the batch never answered
+    is returned as an error too, so the caller records it for retry.
+    """
+    results: dict[str, tuple[str | None, Exception | None]] = {}
+
+    def on_response(request_id, response, exception):
+        if exception is not None:
+            results[request_id] = (None, exception)
+        else:
+            results[request_id] = (response["id"], None)
+
+    batch = service.new_batch_http_request(callback=on_response)
+    queued = []
+    for date_str in dates:
+        try:
+            event = _build_collection_event(date_str, waste_type_display)
+        except Exception as e:
+            results[date_str] = (None, e)
+            continue
+        # Google counts every call inside a batch against the quota, so pace each insert as if
+        # it were sent on its own; batching only saves the HTTP round trips.
+        throttle_calendar()
+        batch.add(service.events().insert(calendarId=calendar_id, body=event), request_id=date_str)
+        queued.append(date_str)
+
+    try:
+        batch.execute()
+    except Exception as e:
+        for date_str in dates:
+            results.setdefault(date_str, (None, e))
+    for date_str in queued:
+        if date_str not in results:
+            logger.warning("No batch response for event on %s; will retry", date_str)
+            results[date_str] = (None, RuntimeError("No response in batch request"))
+    return results
+
+
 def sync_calendar_for_calendar_stream(calendar_stream_id: str) -> dict:
     """
     Sync calendar events for a calendar stream (add new, delete old, retry failed).
@@ -523,228 +598,123 @@ def sync_calendar_for_calendar_stream(calendar_stream_id: str) -> dict:
                 "events_retried": 0,
             }
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT date, event_id, status
-            FROM calendar_stream_events
-            WHERE calendar_stream_id = ?
-        """,
-            (calendar_stream_id,),
-        )
-
-        existing_events = {
-            row[0]: {"event_id": row[1], "status": row[2]} for row in cursor.fetchall()
-        }
-        conn.close()
-
-        current_dates = set(dates)
-        existing_dates = set(existing_events.keys())
-
-        dates_to_add = current_dates - existing_dates
-        dates_to_delete = existing_dates - current_dates
-        dates_to_retry = {
-            date
-            for date, info in existing_events.items()
-            if info["status"] == "error" and date in current_dates
-        }
-
-        logger.info(
-            "In-place update for %s: add %s, delete %s, retry %s, keep %s unchanged",
-            calendar_stream_id,
-            len(dates_to_add),
-            len(dates_to_delete),
-            len(dates_to_retry),
-            len(current_dates & existing_dates),
-        )
-
-        service = get_google_calendar_service()
-        waste_type = stream_info["waste_type"]
-
-        waste_type_display = {
-            "bendros": "Buitinių atliekų surinkimas",
-            "plastikas": "Plastikinių atliekų surinkimas",
-            "stiklas": "Stiklinių atliekų surinkimas",
-        }.get(waste_type, f"{waste_type} surinkimas")
-
-        events_added = 0
-        events_deleted = 0
-        events_retried = 0
-
-        for date_str in dates_to_delete:
-            event_id = existing_events[date_str]["event_id"]
-            if event_id:
-                try:
-                    throttle_calendar()
-                    service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
-                    events_deleted += 1
-                    logger.debug("Deleted event %s for date %s", event_id, date_str)
-                except Exception as e:
-                    logger.error(
-                        "Failed to delete event %s for date %s: %s",
-                        event_id,
-                        date_str,
-                        e,
-                    )
-
-            conn = get_db_connection()
+        # One connection for the whole sync (previously one per event write). Each event row is
+        # still committed right after its Google API call, so no write lock is held across calls.
+        with closing(get_db_connection()) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                DELETE FROM calendar_stream_events
-                WHERE calendar_stream_id = ? AND date = ?
+                SELECT date, event_id, status
+                FROM calendar_stream_events
+                WHERE calendar_stream_id = ?
             """,
-                (calendar_stream_id, date_str),
+                (calendar_stream_id,),
             )
-            conn.commit()
-            conn.close()
 
-        for date_str in dates_to_add:
-            try:
-                date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-                event_date = date_obj.date()
-
-                event = {
-                    "summary": waste_type_display,
-                    "description": "Išvežkite bendrų šiukšlių dėžę",
-                    "start": {
-                        "dateTime": datetime.datetime(
-                            event_date.year,
-                            event_date.month,
-                            event_date.day,
-                            config.GOOGLE_CALENDAR_EVENT_START_HOUR,
-                            0,
-                        ).isoformat(),
-                        "timeZone": config.GOOGLE_CALENDAR_TIMEZONE,
-                    },
-                    "end": {
-                        "dateTime": datetime.datetime(
-                            event_date.year,
-                            event_date.month,
-                            event_date.day,
-                            config.GOOGLE_CALENDAR_EVENT_END_HOUR,
-                            0,
-                        ).isoformat(),
-                        "timeZone": config.GOOGLE_CALENDAR_TIMEZONE,
-                    },
-                    "reminders": {
-                        "useDefault": False,
-                        "overrides": config.GOOGLE_CALENDAR_REMINDERS,
-                    },
-                }
+            existing_events = {
+                row[0]: {"event_id": row[1], "status": row[2]} for row in cursor.fetchall()
+            }
 
-                throttle_calendar()
-                created_event = (
-                    service.events().insert(calendarId=calendar_id, body=event).execute()
-                )
+            current_dates = set(dates)
+            existing_dates = set(existing_events.keys())
 
-                event_id = created_event["id"]
-                events_added += 1
+            dates_to_add = current_dates - existing_dates
+            dates_to_delete = existing_dates - current_dates
+            dates_to_retry = {
+                date
+                for date, info in existing_events.items()
+                if info["status"] == "error" and date in current_dates
+            }
 
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO calendar_stream_events (calendar_stream_id, date, event_id, status)
-                    VALUES (?, ?, ?, 'created')
-                    ON CONFLICT(calendar_stream_id, date) DO UPDATE SET
-                        event_id = ?, status = 'created', updated_at = CURRENT_TIMESTAMP
-                """,
-                    (calendar_stream_id, date_str, event_id, event_id),
-                )
-                conn.commit()
-                conn.close()
+            logger.info(
+                "In-place update for %s: add %s, delete %s, retry %s, keep %s unchanged",
+                calendar_stream_id,
+                len(dates_to_add),
+                len(dates_to_delete),
+                len(dates_to_retry),
+                len(current_dates & existing_dates),
+            )
 
-                logger.debug("Created event %s for date %s", event_id, date_str)
+            service = get_google_calendar_service()
+            waste_type = stream_info["waste_type"]
 
-            except Exception as e:
-                logger.error("Failed to create event for %s: %s", date_str, e)
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO calendar_stream_events (calendar_stream_id, date, status, error_message)
-                    VALUES (?, ?, 'error', ?)
-                    ON CONFLICT(calendar_stream_id, date) DO UPDATE SET
-                        status = 'error', error_message = ?, updated_at = CURRENT_TIMESTAMP
-                """,
-                    (calendar_stream_id, date_str, str(e), str(e)),
-                )
-                conn.commit()
-                conn.close()
-
-        for date_str in dates_to_retry:
-            try:
-                date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-                event_date = date_obj.date()
-
-                event = {
-                    "summary": waste_type_display,
-                    "description": "Išvežkite bendrų šiukšlių dėžę",
-                    "start": {
-                        "dateTime": datetime.datetime(
-                            event_date.year,
-                            event_date.month,
-                            event_date.day,
-                            config.GOOGLE_CALENDAR_EVENT_START_HOUR,
-                            0,
-                        ).isoformat(),
-                        "timeZone": config.GOOGLE_CALENDAR_TIMEZONE,
-                    },
-                    "end": {
-                        "dateTime": datetime.datetime(
-                            event_date.year,
-                            event_date.month,
-                            event_date.day,
-                            config.GOOGLE_CALENDAR_EVENT_END_HOUR,
-                            0,
-                        ).isoformat(),
-                        "timeZone": config.GOOGLE_CALENDAR_TIMEZONE,
-                    },
-                    "reminders": {
-                        "useDefault": False,
-                        "overrides": config.GOOGLE_CALENDAR_REMINDERS,
-                    },
-                }
+            waste_type_display = {
+                "bendros": "Buitinių atliekų surinkimas",
+                "plastikas": "Plastikinių atliekų surinkimas",
+                "stiklas": "Stiklinių atliekų surinkimas",
+            }.get(waste_type, f"{waste_type} surinkimas")
 
-                throttle_calendar()
-                created_event = (
-                    service.events().insert(calendarId=calendar_id, body=event).execute()
-                )
+            events_added = 0
+            events_deleted = 0
+            events_retried = 0
 
-                event_id = created_event["id"]
-                events_retried += 1
+            for date_str in dates_to_delete:
+                event_id = existing_events[date_str]["event_id"]
+                if event_id:
+                    try:
+                        throttle_calendar()
+                        service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+                        events_deleted += 1
+                        logger.debug("Deleted event %s for date %s", event_id, date_str)
+                    except Exception as e:
+                        logger.error(
+                            "Failed to delete event %s for date %s: %s",
+                            event_id,
+                            date_str,
+                            e,
+                        )
 
-                conn = get_db_connection()
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    UPDATE calendar_stream_events
-                    SET event_id = ?, status = 'created', error_message = NULL, updated_at = CURRENT_TIMESTAMP
+                    DELETE FROM calendar_stream_events
                     WHERE calendar_stream_id = ? AND date = ?
                 """,
-                    (event_id, calendar_stream_id, date_str),
+                    (calendar_stream_id, date_str),
                 )
                 conn.commit()
-                conn.close()
 
-                logger.debug("Retried event %s for date %s", event_id, date_str)
-
-            except Exception as e:
-                logger.error("Failed to retry event for %s: %s", date_str, e)
-                conn = get_db_connection()
+            # New and previously failed dates go out together, one batch HTTP request per chunk;
+            # each chunk's rows are committed once its batch has returned.
+            pending_dates = sorted(dates_to_add | dates_to_retry)
+            for start in range(0, len(pending_dates), _EVENT_BATCH_SIZE):
+                chunk = pending_dates[start : start + _EVENT_BATCH_SIZE]
+                results = _insert_events_batch(service, calendar_id, chunk, waste_type_display)
                 cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    UPDATE calendar_stream_events
-                    SET status = 'error', error_message = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE calendar_stream_id = ? AND date = ?
-                """,
-                    (str(e), calendar_stream_id, date_str),
-                )
+                for date_str, (event_id, error) in results.items():
+                    if error is None:
+                        if date_str in dates_to_retry:
+                            events_retried += 1
+                            logger.debug("Retried event %s for date %s", event_id, date_str)
+                        else:
+                            events_added += 1
+                            logger.debug("Created event %s for date %s", event_id, date_str)
+                        cursor.execute(
+                            """
+                            INSERT INTO calendar_stream_events (calendar_stream_id, date, event_id, status)
+                            VALUES (?, ?, ?, 'created')
+                            ON CONFLICT(calendar_stream_id, date) DO UPDATE SET
+                                event_id = excluded.event_id, status = 'created',
+                                error_message = NULL, updated_at = CURRENT_TIMESTAMP
+                        """,
+                            (calendar_stream_id, date_str, event_id),
+                        )
+                    else:
+                        if date_str in dates_to_retry:
+                            logger.error("Failed to retry event for %s: %s", date_str, error)
+                        else:
+                            logger.error("Failed to create event for %s: %s", date_str, error)
+                        cursor.execute(
+                            """
+                            INSERT INTO calendar_stream_events (calendar_stream_id, date, status, error_message)
+                            VALUES (?, ?, 'error', ?)
+                            ON CONFLICT(calendar_stream_id, date) DO UPDATE SET
+                                status = 'error', error_message = excluded.error_message,
+                                updated_at = CURRENT_TIMESTAMP
+                        """,
+                            (calendar_stream_id, date_str, str(error)),
+                        )
                 conn.commit()
-                conn.close()
 
         update_calendar_stream_calendar_synced(calendar_stream_id)
 
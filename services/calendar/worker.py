@@ -14,6 +14,7 @@ from services.calendar import (
     create_calendar_for_calendar_stream,
     sync_calendar_for_calendar_stream,
 )
+from services.common.config_utils import validate_config
 from services.common.db_helpers import (
     get_calendar_streams_needing_sync,
 )
@@ -108,6 +109,7 @@ def calendar_sync_worker():
 
 
 def main():
+    validate_config(require_ai=False)
     calendar_migrations = Path(__file__).parent / "migrations"
     scraper_migrations = Path(__file__).parent.parent / "scraper" / "migrations"
     init_database(migrations_dir=scraper_migrations)
@@ -4,6 +4,7 @@ Shared, read-only Google Calendar helpers for API usage.
 
 import logging
 import os.path
+import threading
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
@@ -16,6 +17,8 @@ from services.common.throttle import throttle
 setup_logging()
 logger = logging.getLogger(__name__)
 
+_local = threading.local()
+
 
 def throttle_calendar() -> None:
     throttle("calendar")
@@ -25,8 +28,14 @@ def get_google_calendar_service():
     """
     Get authenticated Google Calendar service using Service Account.
     Fully headless authentication - no tokens needed.
+
+    The built service is cached per thread (its httplib2 transport isn't thread-safe); service
+    account credentials refresh their own access token, so the cached instance stays usable.
     """
     credentials_file = config.GOOGLE_CALENDAR_CREDENTIALS_FILE
+    cached = getattr(_local, "service", None)
+    if cached is not None and getattr(_local, "credentials_file", None) == credentials_file:
+        return cached
 
     if not os.path.exists(credentials_file):
         raise FileNotFoundError(
@@ -46,13 +55,20 @@ def get_google_calendar_service():
         creds = service_account.Credentials.from_service_account_file(
             credentials_file, scopes=config.GOOGLE_CALENDAR_SCOPES
         )
-        return build("calendar", "v3", credentials=creds)
+        # The discovery document ships with the client library; skip its on-disk cache lookup.
+        service = build(
+            "calendar", "v3", credentials=creds, cache_discovery=False, static_discovery=True
+        )
     except Exception as e:
         raise RuntimeError(
             f"Failed to authenticate with Google Calendar: {e}\n"
             f"Make sure {credentials_file} is a valid Service Account JSON key file"
         ) from e
 
+    _local.service = service
+    _local.credentials_file = credentials_file
+    return service
+
 
 def get_existing_calendar_info(calendar_id: str) -> dict | None:
     """
@@ -0,0 +1,17 @@
+"""
+Startup checks for the local config.py.
+"""
+
+import config
+
+
+def validate_config(require_ai: bool = True) -> None:
+    """
+    Fail fast on missing/empty secret files (see config.validate_config).
+
+    config.py is a local copy of config.example.py; copies that predate validate_config still
+    validate everything at import time, so there is nothing left to check for them here.
+    """
+    validate = getattr(config, "validate_config", None)
+    if validate is not None:
+        validate(require_ai=require_ai)
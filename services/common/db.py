@@ -2,16 +2,52 @@
 Shared DB connection helpers.
 """
 
+import os
 import sqlite3
 from pathlib import Path
 
 DB_PATH = Path(__file__).resolve().parent.parent / "database" / "waste_schedule.db"
 
+# Set once DB_PATH has been seen to exist, so later connections skip the stat call
+_db_ready = False
+
 
 def get_db_connection():
-    """Get a database connection."""
-    if not DB_PATH.exists():
-        raise FileNotFoundError(
-            f"Database not found at {DB_PATH}. Run the scraper or apply migrations."
-        )
-    return sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    """
+    Get a database connection.
+
+    The scrapers, calendar worker and API share one file, so it runs in WAL mode: readers and the
+    writer don't block each other. `journal_mode` persists in the file (a no-op after the first
+    connection); `synchronous=NORMAL` is per-connection and only fsyncs on checkpoints.
+    """
+    global _db_ready
+    if not _db_ready:
+        if not DB_PATH.exists():
+            raise FileNotFoundError(
+                f"Database not found at {DB_PATH}. Run the scraper or apply migrations."
+            )
+        _db_ready = True
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+def get_data_version(conn: sqlite3.Connection) -> str:
+    """
+    Return a cheap change token for the database file behind `conn`.
+
+    Writers (scrapers, calendar worker) run in other processes, so readers can't be told about
+    new data; they compare this token (path + mtime/size of the DB file and its WAL) instead.
+    """
+    row = conn.execute("PRAGMA database_list").fetchone()
+    path = row[2] if row else ""
+    parts = [path]
+    for candidate in (path, f"{path}-wal"):
+        try:
+            st = os.stat(candidate)
+        except OSError:
+            parts.append("0:0")
+            continue
+        parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+    return "|".join(parts)
@@ -2,10 +2,32 @@
 Shared DB helper functions used by API, scraper, and calendar services.
 """
 
-import json
+import re
+from functools import lru_cache
+
+import orjson
 
 from services.common.db import get_db_connection
 
+_DIGIT_RUN = re.compile(r"(\d+)")
+
+
+def parse_dates_json(dates_json: str | None) -> list[str]:
+    """
+    Parse a stored `dates` JSON array (schedule_groups / calendar_streams) into ISO date strings.
+
+    Results are memoized on the JSON text: a group's dates only change when it is rewritten, and
+    then the text (and so the cache key) changes with them.
+    """
+    if not dates_json:
+        return []
+    return list(_parse_dates_json(dates_json))
+
+
+@lru_cache(maxsize=2048)
+def _parse_dates_json(dates_json: str) -> tuple[str, ...]:
+    return tuple(orjson.loads(dates_json))
+
 
 def get_schedule_group_info(schedule_group_id: str) -> dict | None:
     """
@@ -30,7 +52,17 @@ def get_schedule_group_info(schedule_group_id: str) -> dict | None:
     if not row:
         return None
 
-    dates = json.loads(row[6] or "[]")
+    return schedule_group_info_from_row(row)
+
+
+def schedule_group_info_from_row(row: tuple) -> dict:
+    """
+    Build the get_schedule_group_info() dict from a schedule_groups row.
+
+    Row columns: id, waste_type, kaimai_hash, first_date, last_date, date_count, dates,
+    dates_hash, calendar_id, calendar_synced_at, created_at, updated_at.
+    """
+    dates = parse_dates_json(row[6])
 
     return {
         "id": row[0],
@@ -48,6 +80,18 @@ def get_schedule_group_info(schedule_group_id: str) -> dict | None:
     }
 
 
+def house_numbers_sort_key(house_numbers: str | None) -> str | None:
+    """
+    Natural-sort key for a house_numbers value, stored in locations.house_numbers_sort_key.
+
+    Digit runs are zero-padded so that "2" < "10" when SQLite compares the keys as text.
+    """
+    if house_numbers is None:
+        return None
+    parts = _DIGIT_RUN.split(house_numbers.casefold())
+    return "".join(part.zfill(8) if part.isdigit() else part for part in parts)
+
+
 def get_calendar_status(calendar_id: str | None, calendar_synced_at: str | None) -> dict:
     """
     Determine calendar status based on calendar_id and calendar_synced_at.
@@ -83,7 +127,7 @@ def get_calendar_stream_info(calendar_stream_id: str) -> dict | None:
     if not row:
         return None
 
-    dates = json.loads(row[3] or "[]")
+    dates = parse_dates_json(row[3])
 
     return {
         "id": row[0],
@@ -120,17 +164,16 @@ def get_calendar_streams_needing_sync() -> list[dict]:
     """
     )
 
-    results = []
-    for row in cursor.fetchall():
-        results.append(
-            {
-                "id": row[0],
-                "waste_type": row[1],
-                "dates_hash": row[2],
-                "calendar_id": row[3],
-                "calendar_synced_at": row[4],
-            }
-        )
+    results = [
+        {
+            "id": row[0],
+            "waste_type": row[1],
+            "dates_hash": row[2],
+            "calendar_id": row[3],
+            "calendar_synced_at": row[4],
+        }
+        for row in cursor
+    ]
 
     conn.close()
     return results
@@ -153,18 +196,17 @@ def get_calendar_streams_pending_cleanup() -> list[dict]:
     """
     )
 
-    results = []
-    for row in cursor.fetchall():
-        results.append(
-            {
-                "id": row[0],
-                "waste_type": row[1],
-                "calendar_id": row[2],
-                "pending_clean_started_at": row[3],
-                "pending_clean_until": row[4],
-                "pending_clean_notice_sent_at": row[5],
-            }
-        )
+    results = [
+        {
+            "id": row[0],
+            "waste_type": row[1],
+            "calendar_id": row[2],
+            "pending_clean_started_at": row[3],
+            "pending_clean_until": row[4],
+            "pending_clean_notice_sent_at": row[5],
+        }
+        for row in cursor
+    ]
 
     conn.close()
     return results
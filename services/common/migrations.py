@@ -2,6 +2,7 @@
 Shared migration runner for service-owned migrations.
 """
 
+import sqlite3
 from pathlib import Path
 
 from yoyo import get_backend, read_migrations
@@ -9,8 +10,26 @@ from yoyo import get_backend, read_migrations
 from services.common.db import DB_PATH
 
 
+def _all_migrations_applied(db_path: Path, migrations_dir: Path) -> bool:
+    """Cheap pre-check: are all migration files already recorded in yoyo's bookkeeping table?"""
+    if not db_path.exists():
+        return False
+    wanted = {p.stem for p in migrations_dir.glob("*.py") if not p.name.startswith("_")}
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute("SELECT migration_id FROM _yoyo_migration").fetchall()
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+    return wanted <= {row[0] for row in rows}
+
+
 def run_migrations(db_path: Path, migrations_dir: Path) -> None:
     """Apply migrations from a directory to a SQLite database."""
+    # Every service container calls this on start; skip yoyo's lock/read/plan when nothing is new.
+    if _all_migrations_applied(db_path, migrations_dir):
+        return
     backend = get_backend(f"sqlite:///{db_path}")
     migrations = read_migrations(str(migrations_dir))
     backend.apply_migrations(backend.to_apply(migrations))
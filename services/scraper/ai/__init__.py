@@ -1,10 +1,24 @@
 """
 AI parser modules - PydanticAI with OpenAI-compatible providers
+
+Submodules are imported on first attribute access (PEP 562), so importing e.g.
+`services.scraper.ai.router` doesn't pull in pydantic-ai and the provider clients.
 """
 
-from services.scraper.ai.cache import AIParserCache, get_cache
-from services.scraper.ai.parser import parse_with_ai
-from services.scraper.ai.router import should_use_ai_parser
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from services.scraper.ai.cache import AIParserCache, get_cache
+    from services.scraper.ai.parser import parse_with_ai
+    from services.scraper.ai.router import should_use_ai_parser
+
+_LAZY = {
+    "AIParserCache": "services.scraper.ai.cache",
+    "get_cache": "services.scraper.ai.cache",
+    "parse_with_ai": "services.scraper.ai.parser",
+    "should_use_ai_parser": "services.scraper.ai.router",
+}
 
 __all__ = [
     "AIParserCache",
@@ -12,3 +26,11 @@ __all__ = [
     "parse_with_ai",
     "should_use_ai_parser",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,11 +3,17 @@ Cache for AI parser results to avoid re-parsing the same kaimai strings
 Stores results in SQLite database for persistence across runs
 """
 
-import json
+import hashlib
 import sqlite3
-from datetime import datetime
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+import orjson
+
+# Most recently used results kept in memory in front of SQLite (kaimai strings repeat a lot)
+MEMORY_CACHE_SIZE = 10_000
+
 
 class AIParserCache:
     """
@@ -27,13 +33,34 @@ class AIParserCache:
             )
 
         self.db_path = db_path
+        # One connection for the cache's lifetime instead of connect/close per lookup; the lock
+        # keeps it safe if the global cache is ever shared between threads.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, tuple] = OrderedDict()
         self._ensure_cache_table()
 
+    def close(self):
+        """Close the cache's database connection"""
+        self._conn.close()
+
     def _ensure_cache_table(self):
-        """Create cache table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Create cache table if it doesn't exist
+
+        Scraper migration 007 creates it in the main database; this only matters for a standalone
+        cache database (db_path pointing elsewhere, e.g. tests).
+        """
+        conn = self._conn
         cursor = conn.cursor()
 
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ai_parser_cache'"
+        )
+        if cursor.fetchone():
+            return
+
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS ai_parser_cache (
                 kaimai_hash TEXT PRIMARY KEY,
@@ -51,7 +78,13 @@ class AIParserCache:
         """)
 
         conn.commit()
-        conn.close()
+
+    def _remember(self, kaimai_str: str, parsed_result: list) -> None:
+        """Put a result in the in-memory LRU (caller holds the lock)"""
+        self._memory[kaimai_str] = tuple(parsed_result)
+        self._memory.move_to_end(kaimai_str)
+        if len(self._memory) > MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
 
     def get(self, kaimai_str: str) -> list | None:
         """
@@ -63,54 +96,39 @@ class AIParserCache:
         Returns:
             Parsed result (list of tuples: [(village, None), (street1, house_nums1), ...]) or None if not cached
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Use hash for lookup (faster)
-        import hashlib
-
-        kaimai_hash = hashlib.sha256(kaimai_str.encode()).hexdigest()[:16]
-
-        cursor.execute(
-            """
-            SELECT parsed_result, tokens_used
-            FROM ai_parser_cache
-            WHERE kaimai_hash = ?
-        """,
-            (kaimai_hash,),
-        )
-
-        row = cursor.fetchone()
-        conn.close()
-
-        if row:
-            # Update last_used_at
-            self._update_last_used(kaimai_hash)
-
+        # Repeated strings are answered from memory (their last_used_at isn't touched again)
+        with self._lock:
+            remembered = self._memory.get(kaimai_str)
+            if remembered is not None:
+                self._memory.move_to_end(kaimai_str)
+                return list(remembered)
+
+        # Look up by the string itself through idx_ai_cache_kaimai_str: no hashing on the hot
+        # path. Touch last_used_at and read the entry in one statement (one transaction per hit).
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                UPDATE ai_parser_cache
+                SET last_used_at = CURRENT_TIMESTAMP
+                WHERE kaimai_str = ?
+                RETURNING parsed_result, tokens_used
+            """,
+                (kaimai_str,),
+            ).fetchall()
+            self._conn.commit()
+
+        if rows:
+            row = rows[0]
             # Return parsed result (convert lists back to tuples)
-            parsed_result = json.loads(row[0])
+            parsed_result = orjson.loads(row[0])
             # Convert list of lists back to list of tuples
-            return [tuple(item) if isinstance(item, list) else item for item in parsed_result]
+            result = [tuple(item) if isinstance(item, list) else item for item in parsed_result]
+            with self._lock:
+                self._remember(kaimai_str, result)
+            return result
 
         return None
 
-    def _update_last_used(self, kaimai_hash: str):
-        """Update last_used_at timestamp"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            UPDATE ai_parser_cache
-            SET last_used_at = ?
-            WHERE kaimai_hash = ?
-        """,
-            (datetime.now().isoformat(), kaimai_hash),
-        )
-
-        conn.commit()
-        conn.close()
-
     def set(self, kaimai_str: str, parsed_result: list, tokens_used: int = 0):
         """
         Cache a parsed result
@@ -120,36 +138,30 @@ class AIParserCache:
             parsed_result: Parsed result (list of tuples: [(village, None), (street1, house_nums1), ...])
             tokens_used: Tokens used for this parse
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        import hashlib
-
+        # Still the primary key: keep the existing sha256 prefix so rows cached before stay valid
         kaimai_hash = hashlib.sha256(kaimai_str.encode()).hexdigest()[:16]
 
         # Convert tuples to lists for JSON serialization
         serializable_result = [
             list(item) if isinstance(item, tuple) else item for item in parsed_result
         ]
-
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO ai_parser_cache
-            (kaimai_hash, kaimai_str, parsed_result, tokens_used, created_at, last_used_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (
-                kaimai_hash,
+        # Still JSON text (rows written with json.dumps read back the same), via the C encoder
+        parsed_json = orjson.dumps(serializable_result).decode()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO ai_parser_cache
+                (kaimai_hash, kaimai_str, parsed_result, tokens_used)
+                VALUES (?, ?, ?, ?)
+            """,
+                (kaimai_hash, kaimai_str, parsed_json, tokens_used),
+            )
+            self._conn.commit()
+            self._remember(
                 kaimai_str,
-                json.dumps(serializable_result),
-                tokens_used,
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
-            ),
-        )
-
-        conn.commit()
-        conn.close()
+                [tuple(item) if isinstance(item, list) else item for item in serializable_result],
+            )
 
 
 # Global cache instance
@@ -1,16 +1,36 @@
 """
 Core scraper modules - no AI dependencies
+
+Submodules are imported on first attribute access (PEP 562), so importing one of them (e.g.
+`services.scraper.core.db_writer`) doesn't also load the XLSX parser and its pandas/openpyxl stack.
 """
 
-from services.scraper.core.db_writer import write_location_schedule, write_parsed_data
-from services.scraper.core.fetcher import DEFAULT_URL, fetch_xlsx
-from services.scraper.core.parser import (
-    extract_dates_from_cell,
-    parse_street_with_house_numbers,
-    parse_village_and_streets,
-    parse_xlsx,
-)
-from services.scraper.core.validator import validate_file_and_data, validate_parsed_data
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from services.scraper.core.db_writer import write_location_schedule, write_parsed_data
+    from services.scraper.core.fetcher import DEFAULT_URL, fetch_xlsx
+    from services.scraper.core.parser import (
+        extract_dates_from_cell,
+        parse_street_with_house_numbers,
+        parse_village_and_streets,
+        parse_xlsx,
+    )
+    from services.scraper.core.validator import validate_file_and_data, validate_parsed_data
+
+_LAZY = {
+    "DEFAULT_URL": "services.scraper.core.fetcher",
+    "extract_dates_from_cell": "services.scraper.core.parser",
+    "fetch_xlsx": "services.scraper.core.fetcher",
+    "parse_street_with_house_numbers": "services.scraper.core.parser",
+    "parse_village_and_streets": "services.scraper.core.parser",
+    "parse_xlsx": "services.scraper.core.parser",
+    "validate_file_and_data": "services.scraper.core.validator",
+    "validate_parsed_data": "services.scraper.core.validator",
+    "write_location_schedule": "services.scraper.core.db_writer",
+    "write_parsed_data": "services.scraper.core.db_writer",
+}
 
 __all__ = [
     "DEFAULT_URL",
@@ -24,3 +44,11 @@ __all__ = [
     "write_location_schedule",
     "write_parsed_data",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
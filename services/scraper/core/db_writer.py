@@ -9,6 +9,7 @@ import uuid
 from datetime import date, datetime
 
 from services.common.db import get_db_connection
+from services.common.db_helpers import house_numbers_sort_key
 
 
 def generate_kaimai_hash(kaimai_str: str) -> str:
@@ -420,8 +421,11 @@ def write_location_schedule(
     now_str = datetime.now().isoformat()
     cursor.execute(
         """
-        INSERT INTO locations (seniunija, village, street, house_numbers, kaimai_hash, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?)
+        INSERT INTO locations (
+            seniunija, village, street, house_numbers, house_numbers_sort_key, kaimai_hash,
+            updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(seniunija, village, street, house_numbers)
         DO UPDATE SET kaimai_hash = ?, updated_at = ?
     """,
@@ -430,6 +434,7 @@ def write_location_schedule(
             village,
             street,
             house_nums_str,
+            house_numbers_sort_key(house_nums_str),
             kaimai_hash,
             now_str,
             kaimai_hash,
@@ -512,8 +517,8 @@ def write_parsed_data(
     conn.cursor()
 
     try:
-        # Start transaction
-        conn.execute("BEGIN TRANSACTION")
+        # Start transaction; IMMEDIATE takes the write lock now instead of on the first write
+        conn.execute("BEGIN IMMEDIATE")
 
         # Log fetch
         status = "success" if not validation_errors else "validation_error"
@@ -555,6 +560,11 @@ def write_parsed_data(
         # Reconcile calendar streams after all groups are updated
         reconcile_calendar_streams(conn)
 
+        # Refresh planner statistics now that the table contents changed. Inside the same
+        # transaction, so a failing ANALYZE rolls back with the data instead of reporting a
+        # failure for rows that were already committed.
+        conn.execute("ANALYZE locations")
+        conn.execute("ANALYZE schedule_groups")
         conn.commit()
         print(f"Successfully wrote {len(parsed_data)} locations to database")
         return True
@@ -7,6 +7,8 @@ from pathlib import Path
 
 import requests
 
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 # Default URL (will be made dynamic in V1.1)
 DEFAULT_URL = "https://www.nemenkom.lt/uploads/failai/atliekos/Buitini%C5%B3%20atliek%C5%B3%20surinkimo%20grafikai/2026%20m-%20sausio-bir%C5%BEelio%20m%C4%97n%20%20Buitini%C5%B3%20atliek%C5%B3%20surinkimo%20grafikas.xlsx"
 
@@ -29,22 +31,27 @@ def fetch_xlsx(
     """
     print(f"Fetching xlsx from {url}")
 
-    response = requests.get(url, allow_redirects=True, timeout=30)
-    response.raise_for_status()
+    # Stream straight to disk in large chunks instead of holding the whole body in memory
+    byte_len = 0
+    with requests.get(url, allow_redirects=True, timeout=30, stream=True) as response:
+        response.raise_for_status()
 
-    if save_path is None:
-        # Use temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
-        save_path = Path(temp_file.name)
-        temp_file.close()
+        if save_path is None:
+            # Use temporary file
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
+            save_path = Path(temp_file.name)
+            temp_file.close()
 
-    save_path.parent.mkdir(parents=True, exist_ok=True)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(save_path, "wb") as f:
-        f.write(response.content)
+        with open(save_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                byte_len += len(chunk)
+        headers = dict(response.headers or {})
 
-    print(f"Downloaded {len(response.content)} bytes to {save_path}")
-    return save_path, dict(response.headers or {}), len(response.content)
+    print(f"Downloaded {byte_len} bytes to {save_path}")
+    return save_path, headers, byte_len
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ from urllib.parse import urlparse
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from services.common.config_utils import validate_config
 from services.common.db import get_db_connection
 from services.common.fetch_cache import (
     get_latest_cached_fetch,
@@ -185,6 +186,7 @@ def main():
         help="Force parsing even if the remote XLSX is unchanged (bypass HEAD skip).",
     )
     args = parser.parse_args()
+    validate_config(require_ai=not args.skip_ai)
 
     file_path = Path(args.file) if args.file else None
     return run_scraper(skip_ai=args.skip_ai, file_path=file_path, force=args.force)
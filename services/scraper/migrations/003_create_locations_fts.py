@@ -0,0 +1,55 @@
+from yoyo import step
+
+steps = [
+    step(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS locations_fts USING fts5(
+            seniunija,
+            village,
+            street,
+            content='locations',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        );
+        """,
+        "",
+    ),
+    step(
+        """
+        CREATE TRIGGER IF NOT EXISTS locations_fts_ai AFTER INSERT ON locations BEGIN
+            INSERT INTO locations_fts(rowid, seniunija, village, street)
+            VALUES (new.id, new.seniunija, new.village, new.street);
+        END;
+        """,
+        "",
+    ),
+    step(
+        """
+        CREATE TRIGGER IF NOT EXISTS locations_fts_ad AFTER DELETE ON locations BEGIN
+            INSERT INTO locations_fts(locations_fts, rowid, seniunija, village, street)
+            VALUES ('delete', old.id, old.seniunija, old.village, old.street);
+        END;
+        """,
+        "",
+    ),
+    step(
+        """
+        CREATE TRIGGER IF NOT EXISTS locations_fts_au
+        AFTER UPDATE OF seniunija, village, street ON locations BEGIN
+            INSERT INTO locations_fts(locations_fts, rowid, seniunija, village, street)
+            VALUES ('delete', old.id, old.seniunija, old.village, old.street);
+            INSERT INTO locations_fts(rowid, seniunija, village, street)
+            VALUES (new.id, new.seniunija, new.village, new.street);
+        END;
+        """,
+        "",
+    ),
+    # Index locations that existed before this migration
+    step(
+        """
+        INSERT INTO locations_fts(locations_fts) VALUES ('rebuild');
+        """,
+        "",
+    ),
+]
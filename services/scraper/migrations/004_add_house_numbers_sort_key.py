@@ -0,0 +1,34 @@
+from yoyo import step
+
+from services.common.db_helpers import house_numbers_sort_key
+
+
+def backfill_house_numbers_sort_key(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, house_numbers FROM locations WHERE house_numbers IS NOT NULL")
+    rows = cursor.fetchall()
+    cursor.executemany(
+        "UPDATE locations SET house_numbers_sort_key = ? WHERE id = ?",
+        [
+            (house_numbers_sort_key(house_numbers), location_id)
+            for location_id, house_numbers in rows
+        ],
+    )
+
+
+steps = [
+    step(
+        """
+        ALTER TABLE locations ADD COLUMN house_numbers_sort_key TEXT;
+        """,
+        "",
+    ),
+    step(backfill_house_numbers_sort_key),
+    step(
+        """
+        CREATE INDEX IF NOT EXISTS idx_locations_house_numbers_sort
+        ON locations(seniunija, village, street, house_numbers_sort_key);
+        """,
+        "",
+    ),
+]
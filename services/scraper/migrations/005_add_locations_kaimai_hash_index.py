@@ -0,0 +1,19 @@
+from yoyo import step
+
+steps = [
+    # get_schedule_group_schedule lists a group's locations by kaimai_hash
+    step(
+        """
+        CREATE INDEX IF NOT EXISTS idx_locations_kaimai_hash
+        ON locations(kaimai_hash);
+        """,
+        "",
+    ),
+    # Give the query planner row counts for the new index
+    step(
+        """
+        ANALYZE;
+        """,
+        "",
+    ),
+]
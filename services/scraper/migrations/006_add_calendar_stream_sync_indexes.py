@@ -0,0 +1,23 @@
+from yoyo import step
+
+steps = [
+    # Partial indexes for the calendar worker's polling queries (get_calendar_streams_needing_sync,
+    # get_calendar_streams_pending_cleanup): only the few streams with work to do are indexed.
+    step(
+        """
+        CREATE INDEX IF NOT EXISTS idx_calendar_streams_needing_sync
+        ON calendar_streams(updated_at)
+        WHERE (calendar_id IS NULL OR calendar_synced_at IS NULL)
+          AND pending_clean_started_at IS NULL;
+        """,
+        "",
+    ),
+    step(
+        """
+        CREATE INDEX IF NOT EXISTS idx_calendar_streams_pending_cleanup
+        ON calendar_streams(pending_clean_started_at)
+        WHERE pending_clean_started_at IS NOT NULL;
+        """,
+        "",
+    ),
+]
@@ -0,0 +1,26 @@
+from yoyo import step
+
+steps = [
+    # AI parser result cache (services/scraper/ai/cache.py); previously only created lazily by
+    # AIParserCache itself.
+    step(
+        """
+        CREATE TABLE IF NOT EXISTS ai_parser_cache (
+            kaimai_hash TEXT PRIMARY KEY,
+            kaimai_str TEXT NOT NULL,
+            parsed_result TEXT NOT NULL,  -- JSON string
+            tokens_used INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """,
+        "",
+    ),
+    step(
+        """
+        CREATE INDEX IF NOT EXISTS idx_ai_cache_kaimai_str
+        ON ai_parser_cache(kaimai_str);
+        """,
+        "",
+    ),
+]
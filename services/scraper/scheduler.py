@@ -14,6 +14,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from services.common.config_utils import validate_config
 from services.common.logging_utils import setup_logging
 from services.common.migrations import init_database
 from services.scraper.main import run_scraper
@@ -74,6 +75,7 @@ def main():
     setup_logging()
     logger = logging.getLogger(__name__)
     logger.info("Scheduler started")
+    validate_config()
 
     # Ensure scraper-owned migrations are applied on container start.
     migrations_dir = Path(__file__).parent / "migrations"
@@ -9,6 +9,8 @@ from urllib.parse import urlparse
 
 import requests
 
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 
 def fetch_pdf(
     url: str, save_path: Path | None = None, timeout_seconds: int = 60
@@ -16,17 +18,24 @@ def fetch_pdf(
     """
     Download a PDF file and return (path, sha256 hex digest, response headers, byte length).
     """
-    resp = requests.get(url, allow_redirects=True, timeout=timeout_seconds)
-    resp.raise_for_status()
+    # Stream to disk and hash in the same pass (1 MiB chunks) rather than buffering the whole PDF
+    sha = hashlib.sha256()
+    byte_len = 0
+    with requests.get(url, allow_redirects=True, timeout=timeout_seconds, stream=True) as resp:
+        resp.raise_for_status()
+
+        if save_path is None:
+            name = Path(urlparse(url).path).name or "waste_schedule.pdf"
+            tmp = Path(tempfile.gettempdir()) / name
+            save_path = tmp
 
-    content = resp.content
-    sha = hashlib.sha256(content).hexdigest()
+        save_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if save_path is None:
-        name = Path(urlparse(url).path).name or "waste_schedule.pdf"
-        tmp = Path(tempfile.gettempdir()) / name
-        save_path = tmp
+        with open(save_path, "wb") as f:
+            for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                sha.update(chunk)
+                f.write(chunk)
+                byte_len += len(chunk)
+        headers = dict(resp.headers or {})
 
-    save_path.parent.mkdir(parents=True, exist_ok=True)
-    save_path.write_bytes(content)
-    return save_path, sha, dict(resp.headers or {}), len(content)
+    return save_path, sha.hexdigest(), headers, byte_len
@@ -13,6 +13,7 @@ from urllib.parse import urlparse
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import config
+from services.common.config_utils import validate_config
 from services.common.db import get_db_connection
 from services.common.fetch_cache import (
     get_latest_cached_fetch,
@@ -289,6 +290,7 @@ def main():
         help="Year for date validation (default: 2026)",
     )
     args = parser.parse_args()
+    validate_config(require_ai=not args.skip_ai)
 
     if args.source and not args.url and not args.file:
         if args.source == "plastikas":
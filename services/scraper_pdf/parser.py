@@ -504,6 +504,17 @@ def ensure_pdf_parsed_rows_table(conn: sqlite3.Connection) -> None:
         conn.execute("ALTER TABLE pdf_parsed_rows ADD COLUMN mapping_method TEXT")
     except sqlite3.OperationalError:
         pass
+    # The API matches selections on these exact expressions (see _get_pdf_kaimai_hash_for_selection)
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_pdf_parsed_rows_selection
+        ON pdf_parsed_rows(
+            waste_type,
+            COALESCE(mapped_seniunija, seniunija),
+            COALESCE(mapped_village, village)
+        )
+        """
+    )
     conn.commit()
 
 
@@ -512,8 +523,11 @@ def save_pdf_parsed_rows(results: list[dict], source_file: str, source_year: int
         return
     conn = get_db_connection()
     ensure_pdf_parsed_rows_table(conn)
+    # Take the write lock up front so the rewrite below is one transaction and one fsync.
+    conn.execute("BEGIN IMMEDIATE")
     conn.execute("DELETE FROM pdf_parsed_rows WHERE source_file = ?", (source_file,))
     touched_schedule_groups: set[tuple[str, str]] = set()  # (waste_type, kaimai_hash)
+    parsed_rows: list[tuple] = []
     for item in results:
         kaimai_str = clean_cell(item.get("kaimai_str", ""))
         kaimai_hash = generate_kaimai_hash(kaimai_str) if kaimai_str else ""
@@ -525,15 +539,7 @@ def save_pdf_parsed_rows(results: list[dict], source_file: str, source_year: int
         # mismatches in API queries.
         street = (item.get("street") or "").strip()
         mapped_street = (item.get("mapped_street") or "").strip()
-        conn.execute(
-            """
-            INSERT INTO pdf_parsed_rows (
-                source_file, source_year, waste_type, kaimai_hash, kaimai_str, seniunija,
-                mapped_seniunija, village, mapped_village, street, mapped_street, house_numbers,
-                exclude_streets_json, dates_json, dates_hash, mapping_method
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        parsed_rows.append(
             (
                 source_file,
                 source_year,
@@ -551,7 +557,7 @@ def save_pdf_parsed_rows(results: list[dict], source_file: str, source_year: int
                 dates_json,
                 dates_hash,
                 item.get("mapping_method") or "none",
-            ),
+            )
         )
 
         # Materialize into schedule_groups/calendar_streams so the web/API can serve plastikas/stiklas schedules.
@@ -564,6 +570,18 @@ def save_pdf_parsed_rows(results: list[dict], source_file: str, source_year: int
                 calendar_stream_id = find_or_create_calendar_stream(conn, dates, waste_type)
                 upsert_group_calendar_link(conn, schedule_group_id, calendar_stream_id)
 
+    conn.executemany(
+        """
+        INSERT INTO pdf_parsed_rows (
+            source_file, source_year, waste_type, kaimai_hash, kaimai_str, seniunija,
+            mapped_seniunija, village, mapped_village, street, mapped_street, house_numbers,
+            exclude_streets_json, dates_json, dates_hash, mapping_method
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        parsed_rows,
+    )
+
     # Keep streams consistent if any groups changed/added (split/merge behavior, pending cleanup, etc.)
     if touched_schedule_groups:
         reconcile_calendar_streams(conn)
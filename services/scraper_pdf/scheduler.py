@@ -18,6 +18,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import config
+from services.common.config_utils import validate_config
 from services.common.logging_utils import setup_logging
 from services.common.migrations import init_database
 
@@ -103,6 +104,7 @@ def main() -> None:
     setup_logging()
     logger = logging.getLogger(__name__)
     logger.info("PDF scheduler started")
+    validate_config()
 
     # Ensure core tables exist (schedule_groups + calendar_streams + calendar tables).
     scraper_migrations = Path(__file__).parent.parent / "scraper" / "migrations"
@@ -72,6 +72,40 @@ def disable_throttle_env():
     yield
 
 
+@pytest.fixture
+def calendar_service():
+    """
+    MagicMock Google Calendar service whose batch requests run their calls one by one.
+
+    Configure `events().insert().execute` etc. as usual; batched calls hit the same mocks.
+    """
+    from unittest.mock import MagicMock
+
+    service = MagicMock()
+
+    def new_batch_http_request(callback=None):
+        requests = []
+        batch = MagicMock()
+        batch.add.side_effect = lambda request, request_id=None: requests.append(
+            (request, request_id)
+        )
+
+        def execute():
+            for request, request_id in requests:
+                try:
+                    response = request.execute()
+                except Exception as e:
+                    callback(request_id, None, e)
+                else:
+                    callback(request_id, response, None)
+
+        batch.execute.side_effect = execute
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    return service
+
+
 @pytest.fixture
 def sample_xlsx_path():
     """Path to sample XLSX file"""
@@ -261,6 +261,38 @@ class TestNormalizeHouseNumbers:
         assert normalize_house_numbers("2-20A,1-19") == "2-20A,1-19"
 
 
+class TestAIParserCache:
+    """Test the SQLite-backed AI parser result cache"""
+
+    def test_round_trip(self, temp_cache_db):
+        """Test that cached results come back as tuples and misses return None"""
+        from services.scraper.ai.cache import AIParserCache
+
+        cache = AIParserCache(db_path=temp_cache_db)
+        try:
+            assert cache.get("Avižieniai (Pušų g.)") is None
+
+            cache.set("Avižieniai (Pušų g.)", [("Avižieniai", None), ("Pušų g.", "1-9")], 42)
+
+            assert cache.get("Avižieniai (Pušų g.)") == [
+                ("Avižieniai", None),
+                ("Pušų g.", "1-9"),
+            ]
+            assert cache.get("Avižieniai") is None
+        finally:
+            cache.close()
+
+        # A fresh instance (empty in-memory LRU) reads the same result back from SQLite
+        reopened = AIParserCache(db_path=temp_cache_db)
+        try:
+            assert reopened.get("Avižieniai (Pušų g.)") == [
+                ("Avižieniai", None),
+                ("Pušų g.", "1-9"),
+            ]
+        finally:
+            reopened.close()
+
+
 class TestAIParserIntegration:
     """Integration tests that actually call the AI parser (uses tokens)
 
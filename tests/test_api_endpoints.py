@@ -15,6 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from services.api.db import (
     get_all_locations,
     get_location_schedule,
+    resolve_schedule,
     search_locations,
     street_has_house_numbers,
     village_has_streets,
@@ -117,8 +118,18 @@ def test_search_locations(test_db_with_data):
         assert len(results) > 0
         assert any(loc["village"] == "Aleksandravas" for loc in results)
 
+        # Prefix, case- and diacritic-insensitive matching via the FTS index
+        results = search_locations("aleks")
+        assert any(loc["village"] == "Aleksandravas" for loc in results)
+        results = search_locations("avizieniu aleks")
+        assert any(loc["seniunija"] == "Avižienių" for loc in results)
+
         results = search_locations("nonexistent")
         assert len(results) == 0
+
+        # FTS syntax characters are treated as plain text
+        assert search_locations('"') == []
+        assert search_locations("AND OR (") == []
     finally:
         api_db_module.get_db_connection = original_get_conn
 
@@ -231,6 +242,243 @@ def test_street_has_house_numbers(test_db_with_village_and_streets):
         api_db_module.get_db_connection = original_get_conn
 
 
+def test_metadata_helpers_see_new_writes(test_db_with_village_and_streets):
+    """Memoized metadata helpers must not serve stale answers after the DB changes"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        assert village_has_streets("Test", "SimpleVillage") is False
+        assert street_has_house_numbers("Test", "VillageWithStreets", "Main Street") is False
+
+        from datetime import date
+
+        conn = sqlite3.connect(db_path)
+        write_location_schedule(
+            conn,
+            "Test",
+            "SimpleVillage",
+            "New Street",
+            [date(2026, 2, 5)],
+            "SimpleVillage (New Street)",
+            None,
+            "bendros",
+        )
+        write_location_schedule(
+            conn,
+            "Test",
+            "VillageWithStreets",
+            "Main Street",
+            [date(2026, 2, 5)],
+            "VillageWithStreets (Main Street 7)",
+            "7",
+            "bendros",
+        )
+        conn.commit()
+        conn.close()
+
+        assert village_has_streets("Test", "SimpleVillage") is True
+        assert street_has_house_numbers("Test", "VillageWithStreets", "Main Street") is True
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_data_version_sees_commits_with_unchanged_file_stats(test_db_with_village_and_streets):
+    """A commit must change the data version even if the DB/WAL stats come out identical,
+    and every thread must see the same token"""
+    from unittest.mock import patch
+
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        # e.g. a checkpoint that leaves the same mtime (coarse clock) and size behind
+        with patch.object(api_db_module, "_get_data_version", return_value="same"):
+            before = api_db_module.get_data_version()
+            assert api_db_module.get_data_version() == before
+
+            conn = sqlite3.connect(db_path)
+            conn.execute("UPDATE locations SET kaimai_hash = kaimai_hash")
+            conn.commit()
+            conn.close()
+
+            # A thread whose connection opens after the commit sees the change before any other
+            # thread has looked, and every thread agrees on the new token
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                after = pool.submit(api_db_module.get_data_version).result()
+            assert after != before
+            assert api_db_module.get_data_version() == after
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_resolve_schedule(test_db_with_village_and_streets):
+    """Test resolve_schedule returns validation flags and schedule in one call"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        # Village without streets: street is ignored, schedule resolved
+        resolved = resolve_schedule("Test", "SimpleVillage", "Ignored", None)
+        assert resolved["has_streets"] is False
+        assert resolved["has_house_numbers"] is False
+        assert resolved["schedule"]["street"] == ""
+        assert len(resolved["schedule"]["dates"]) == 2
+
+        # Village with streets but no street selected
+        resolved = resolve_schedule("Test", "VillageWithStreets", None, None)
+        assert resolved["has_streets"] is True
+        assert resolved["schedule"] is None
+
+        # Street with house numbers
+        resolved = resolve_schedule("Test", "VillageWithStreets", "Second Street", "1, 2, 3")
+        assert resolved["has_house_numbers"] is True
+        assert resolved["schedule"]["house_numbers"] == "1, 2, 3"
+        assert resolved["schedule"]["schedule_group_id"] is not None
+
+        # Non-existent village
+        resolved = resolve_schedule("Test", "NonExistent", None, None)
+        assert resolved == {"has_streets": False, "has_house_numbers": False, "schedule": None}
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_api_schedule_multi_bendros(test_db_with_village_and_streets):
+    """Test schedule-multi resolves the bendros schedule for a street selection"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        from services.api.app import app
+
+        with app.test_client() as client:
+            response = client.get(
+                "/api/v1/schedule-multi?seniunija=Test&village=VillageWithStreets"
+                "&street=Second%20Street&house_numbers=1,%202,%203"
+            )
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data["available_waste_types"] == ["bendros"]
+            bendros = data["schedules"]["bendros"]
+            assert bendros["street"] == "Second Street"
+            assert bendros["house_numbers"] == "1, 2, 3"
+            assert len(data["dates"]) == len(bendros["dates"])
+
+            response = client.get(
+                "/api/v1/schedule-multi?seniunija=Test&village=VillageWithStreets"
+            )
+            assert response.status_code == 400
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_api_schedule_columnar_dates(test_db_with_village_and_streets):
+    """Test ?format=soa returns dates as parallel date/waste_type arrays"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        from services.api.app import app
+
+        with app.test_client() as client:
+            url = "/api/v1/schedule?seniunija=Test&village=SimpleVillage"
+            rows = client.get(url).get_json()
+            columns = client.get(url + "&format=soa").get_json()
+
+            assert columns["dates"] == {
+                "date": [d["date"] for d in rows["dates"]],
+                "waste_type": [d["waste_type"] for d in rows["dates"]],
+            }
+            assert {k: v for k, v in columns.items() if k != "dates"} == {
+                k: v for k, v in rows.items() if k != "dates"
+            }
+
+            group_url = f"/api/v1/schedule-group/{rows['schedule_group_id']}?format=soa"
+            group = client.get(group_url).get_json()
+            assert group["dates"] == columns["dates"]
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_api_locations_columnar(test_db_with_village_and_streets):
+    """Test ?format=soa returns locations as one array per field"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        from services.api.app import app
+
+        with app.test_client() as client:
+            for url in ("/api/v1/locations", "/api/v1/locations?q=Test"):
+                rows = client.get(url).get_json()
+                sep = "&" if "?" in url else "?"
+                columns = client.get(f"{url}{sep}format=soa").get_json()
+
+                assert columns["count"] == rows["count"] > 0
+                assert columns["locations"] == {
+                    key: [location[key] for location in rows["locations"]]
+                    for key in rows["locations"][0]
+                }
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
 def test_api_schedule_village_without_streets(test_db_with_village_and_streets):
     """Test API schedule endpoint for village without streets (no street parameter needed)"""
     db_path = test_db_with_village_and_streets
@@ -500,3 +748,410 @@ def test_duplicate_village_names_different_seniūnija(test_db_with_village_and_s
         assert other_village["village"] == "SimpleVillage"
     finally:
         api_db_module.get_db_connection = original_get_conn
+
+
+def test_api_villages_etag_and_invalidation(test_db_with_village_and_streets):
+    """Test /api/v1/villages answers 304 for a matching ETag and refreshes after a DB write"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        from services.api.app import app
+
+        with app.test_client() as client:
+            response = client.get("/api/v1/villages")
+            assert response.status_code == 200
+            etag = response.headers["ETag"]
+
+            response = client.get("/api/v1/villages", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+
+            # A write from another connection (the scraper) must invalidate the cached body
+            from datetime import date
+
+            from services.scraper.core.db_writer import write_location_schedule
+
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            write_location_schedule(
+                conn, "Test", "NewVillage", "", [date(2026, 1, 15)], "NewVillage", None, "bendros"
+            )
+            conn.commit()
+            conn.close()
+
+            response = client.get("/api/v1/villages", headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+            assert any(v["village"] == "NewVillage" for v in response.get_json()["villages"])
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_api_get_cache_keyed_on_query_string(test_db_with_village_and_streets):
+    """Test cached GET views key on the query string and never cache error responses"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        from services.api.app import app
+
+        with app.test_client() as client:
+            with_streets = client.get("/api/v1/streets?seniunija=Test&village=VillageWithStreets")
+            without_streets = client.get("/api/v1/streets?seniunija=Test&village=SimpleVillage")
+            assert with_streets.status_code == 200
+            assert without_streets.status_code == 200
+            assert with_streets.headers["ETag"] != without_streets.headers["ETag"]
+            assert with_streets.headers["Cache-Control"].startswith("public, max-age=")
+
+            # Argument order doesn't matter: served from the same cache entry
+            reordered = client.get(
+                "/api/v1/streets?village=VillageWithStreets&seniunija=Test",
+                headers={"If-None-Match": with_streets.headers["ETag"]},
+            )
+            assert reordered.status_code == 304
+
+            # Args the view doesn't read don't get their own entries
+            from services.api.app import _CACHE
+
+            cached = len(_CACHE)
+            for junk in ("1", "2", "3"):
+                response = client.get(
+                    f"/api/v1/streets?seniunija=Test&village=VillageWithStreets&x={junk}",
+                    headers={"If-None-Match": with_streets.headers["ETag"]},
+                )
+                assert response.status_code == 304
+            assert len(_CACHE) == cached
+
+            # Missing street is a 400 and must not be cached or marked cacheable
+            response = client.get("/api/v1/schedule?seniunija=Test&village=VillageWithStreets")
+            assert response.status_code == 400
+            assert "Cache-Control" not in response.headers
+            assert "ETag" not in response.headers
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_api_connection_reused_per_thread(test_db_with_data):
+    """Test API helpers share one connection per thread and follow a swapped factory"""
+    import threading
+
+    db_path, location_id = test_db_with_data
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+    opened = []
+
+    def mock_get_conn():
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        opened.append(conn)
+        return conn
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        get_all_locations()
+        search_locations("Aleksandravas")
+        assert get_location_schedule(location_id=location_id) is not None
+        # This thread's connection plus the one shared connection get_data_version reads from
+        assert len(opened) == 2
+
+        # Other threads get their own connection
+        worker = threading.Thread(target=get_all_locations)
+        worker.start()
+        worker.join()
+        assert len(opened) == 3
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_api_hierarchy(test_db_with_village_and_streets):
+    """Test /api/v1/hierarchy returns the nested tree and is gzipped on request"""
+    import gzip
+    import json
+
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        from services.api.app import app
+
+        with app.test_client() as client:
+            response = client.get("/api/v1/hierarchy")
+            assert response.status_code == 200
+            hierarchy = response.get_json()["hierarchy"]
+            assert hierarchy["Test"]["SimpleVillage"] == {"": []}
+            assert hierarchy["Test"]["VillageWithStreets"] == {
+                "Main Street": [],
+                "Second Street": ["1, 2, 3"],
+            }
+
+            # Small bodies are sent as-is even when gzip is accepted
+            response = client.get("/api/v1/hierarchy", headers={"Accept-Encoding": "gzip"})
+            assert "Content-Encoding" not in response.headers
+            assert "Accept-Encoding" in response.headers["Vary"]
+
+        # Large bodies are served precompressed
+        from datetime import date
+
+        conn = sqlite3.connect(db_path)
+        for i in range(50):
+            village = f"Village{i:02d}"
+            write_location_schedule(
+                conn, "Test", village, "", [date(2026, 1, 8)], village, None, "bendros"
+            )
+        conn.commit()
+        conn.close()
+
+        with app.test_client() as client:
+            response = client.get("/api/v1/hierarchy", headers={"Accept-Encoding": "gzip"})
+            assert response.headers["Content-Encoding"] == "gzip"
+            hierarchy = json.loads(gzip.decompress(response.get_data()))["hierarchy"]
+            assert "Village49" in hierarchy["Test"]
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_get_schedule_group_schedule(test_db_with_village_and_streets):
+    """Test get_schedule_group_schedule returns group metadata, member locations and dates"""
+    from services.api.db import get_schedule_group_schedule
+
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        schedule = get_location_schedule(seniunija="Test", village="SimpleVillage", street="")
+        group_id = schedule["schedule_group_id"]
+
+        result = get_schedule_group_schedule(group_id)
+        assert result["schedule_group_id"] == group_id
+        assert result["metadata"]["waste_type"] == "bendros"
+        assert result["metadata"]["date_count"] == 2
+        assert result["metadata"]["calendar_id"] is None
+        assert [loc["village"] for loc in result["locations"]] == ["SimpleVillage"]
+        assert set(result["locations"][0]) == {
+            "id",
+            "seniunija",
+            "village",
+            "street",
+            "house_numbers",
+        }
+        assert result["location_count"] == 1
+        assert [d["date"] for d in result["dates"]] == ["2026-01-08", "2026-01-22"]
+
+        result = get_schedule_group_schedule(group_id, waste_type="plastikas")
+        assert "error" in result
+
+        result = get_schedule_group_schedule("sg_missing")
+        assert result["error"] == "Schedule group not found"
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_api_gzip_uncached_json():
+    """Test uncached JSON responses (e.g. the API spec) are gzipped when the client accepts it"""
+    import gzip
+    import json
+
+    from services.api.app import app
+
+    with app.test_client() as client:
+        plain = client.get("/apispec.json")
+        assert plain.status_code == 200
+        assert "Content-Encoding" not in plain.headers
+
+        # The spec is built once and served from a snapshot afterwards
+        again = client.get("/apispec.json")
+        assert again.get_data() == plain.get_data()
+        assert again.headers["Cache-Control"] == "public, max-age=3600"
+
+        compressed = client.get("/apispec.json", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["Vary"]
+        assert json.loads(gzip.decompress(compressed.get_data())) == plain.get_json()
+
+
+def test_api_locations(test_db_with_village_and_streets):
+    """Test /api/v1/locations encodes a valid {"locations": [...], "count": n} document"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        from services.api.app import app
+
+        with app.test_client() as client:
+            response = client.get("/api/v1/locations")
+            data = response.get_json()
+            assert data["count"] == 3
+            assert data["locations"] == get_all_locations()
+
+            # The full dump is served from the response cache, so it revalidates through the ETag
+            response = client.get(
+                "/api/v1/locations", headers={"If-None-Match": response.headers["ETag"]}
+            )
+            assert response.status_code == 304
+
+            data = client.get("/api/v1/locations?q=Second").get_json()
+            assert data["count"] == 1
+            assert data["locations"][0]["street"] == "Second Street"
+
+            # Query is normalized before searching
+            data = client.get("/api/v1/locations?q=%20%20SECOND%22*%20").get_json()
+            assert data["count"] == 1
+
+            # A query with nothing searchable left after cleaning matches nothing
+            data = client.get("/api/v1/locations?q=!!!").get_json()
+            assert data == {"locations": [], "count": 0}
+
+            # A blank query is the same as no query
+            data = client.get("/api/v1/locations?q=%20%20").get_json()
+            assert data["count"] == 3
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_house_numbers_natural_order(test_db_with_village_and_streets):
+    """Test house numbers come back in natural order ("2" before "10")"""
+    from datetime import date
+
+    from services.api.db import get_house_numbers_for_street
+    from services.common.db_helpers import house_numbers_sort_key
+
+    assert house_numbers_sort_key(None) is None
+    assert house_numbers_sort_key("2") < house_numbers_sort_key("10")
+    assert house_numbers_sort_key("Nr. 9A") < house_numbers_sort_key("nr. 10")
+
+    db_path = test_db_with_village_and_streets
+    conn = sqlite3.connect(db_path)
+    for house_numbers in ["10", "2", "1-9"]:
+        write_location_schedule(
+            conn,
+            "Test",
+            "NumberedVillage",
+            "Long Street",
+            [date(2026, 1, 8)],
+            f"NumberedVillage (Long Street {house_numbers})",
+            house_numbers,
+            "bendros",
+        )
+    conn.commit()
+    conn.close()
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        assert get_house_numbers_for_street("Test", "NumberedVillage", "Long Street") == [
+            "1-9",
+            "2",
+            "10",
+        ]
+    finally:
+        api_db_module.get_db_connection = original_get_conn
+
+
+def test_clean_q():
+    """Test search query normalization"""
+    from services.api.app import clean_q
+
+    assert clean_q("  Vilnius ") == "vilnius"
+    assert clean_q('Main "Street" (AND)*') == "main street and"
+    assert clean_q("Nemenčinė") == "nemenčinė"
+    assert clean_q("Ave\u0301") == clean_q("Avé")
+    assert len(clean_q("x" * 500)) == 64
+
+
+def test_api_head_and_options(test_db_with_village_and_streets):
+    """Test HEAD is served from the response cache, OPTIONS lists the methods, POST is a JSON 405"""
+    db_path = test_db_with_village_and_streets
+
+    # Mock get_db_connection
+    import services.api.db as api_db_module
+
+    original_get_conn = api_db_module.get_db_connection
+
+    def mock_get_conn():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    api_db_module.get_db_connection = mock_get_conn
+
+    try:
+        from unittest.mock import patch
+
+        from services.api.app import app
+
+        with app.test_client() as client:
+            get_response = client.get("/api/v1/villages")
+
+            # Cached entry answers HEAD without calling the DB helper again
+            with patch("services.api.app.get_unique_villages") as helper:
+                head_response = client.head("/api/v1/villages")
+                helper.assert_not_called()
+            assert head_response.status_code == 200
+            assert head_response.get_data() == b""
+            assert head_response.headers["ETag"] == get_response.headers["ETag"]
+
+            response = client.options("/api/v1/villages")
+            assert response.status_code == 200
+            assert response.get_data() == b""
+            # Werkzeug builds this header from a set, so the order varies between runs
+            assert set(response.headers["Allow"].split(", ")) == {"GET", "HEAD", "OPTIONS"}
+
+            response = client.post("/api/v1/villages")
+            assert response.status_code == 405
+            assert response.get_json() == {"error": "Only GET method is allowed"}
+            assert response.headers["Allow"] == "GET, HEAD, OPTIONS"
+    finally:
+        api_db_module.get_db_connection = original_get_conn
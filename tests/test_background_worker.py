@@ -121,7 +121,7 @@ def test_worker_creates_calendar_for_new_groups(temp_db):
     assert row[0] == "worker_calendar@google.com", "Calendar ID should be stored"
 
 
-def test_worker_syncs_events_for_unsynced_calendars(temp_db):
+def test_worker_syncs_events_for_unsynced_calendars(temp_db, calendar_service):
     """Test that worker syncs events for calendars with calendar_id but no calendar_synced_at"""
     conn, db_path = temp_db
 
@@ -156,7 +156,7 @@ def test_worker_syncs_events_for_unsynced_calendars(temp_db):
     conn.commit()
 
     # Mock calendar service
-    mock_service = MagicMock()
+    mock_service = calendar_service
     mock_event = {"id": "event123"}
     mock_service.events().insert().execute.return_value = mock_event
 
@@ -178,7 +178,7 @@ def test_worker_syncs_events_for_unsynced_calendars(temp_db):
     assert row[0] is not None, "calendar_synced_at should be set after sync"
 
 
-def test_worker_handles_date_changes(temp_db):
+def test_worker_handles_date_changes(temp_db, calendar_service):
     """Test that worker detects date changes and re-syncs events"""
     conn, db_path = temp_db
 
@@ -239,7 +239,7 @@ def test_worker_handles_date_changes(temp_db):
     assert row[0] is None, "calendar_synced_at should be NULL for new stream"
 
     # Mock calendar service
-    mock_service = MagicMock()
+    mock_service = calendar_service
     mock_event = {"id": "event_new"}
     mock_service.events().insert().execute.return_value = mock_event
 
@@ -41,7 +41,7 @@ def create_test_calendar_stream_with_calendar(
     return calendar_stream_id
 
 
-def test_sync_adds_new_events(temp_db):
+def test_sync_adds_new_events(temp_db, calendar_service):
     """Test that sync adds new events for new dates"""
     conn, db_path = temp_db
 
@@ -56,7 +56,7 @@ def test_sync_adds_new_events(temp_db):
     )
 
     # Mock Google Calendar service
-    mock_service = MagicMock()
+    mock_service = calendar_service
     mock_event = {"id": "event123"}
     mock_service.events().insert().execute.return_value = mock_event
 
@@ -168,7 +168,7 @@ def test_sync_deletes_old_events(temp_db):
         assert mock_service.events().delete.call_count == 1, "Should call delete once"
 
 
-def test_sync_updates_mixed_changes(temp_db):
+def test_sync_updates_mixed_changes(temp_db, calendar_service):
     """Test sync with both additions and deletions"""
     conn, db_path = temp_db
 
@@ -195,7 +195,7 @@ def test_sync_updates_mixed_changes(temp_db):
     conn.commit()
 
     # Mock Google Calendar service
-    mock_service = MagicMock()
+    mock_service = calendar_service
     mock_event = {"id": "event_new"}
     mock_service.events().insert().execute.return_value = mock_event
 
@@ -221,7 +221,7 @@ def test_sync_updates_mixed_changes(temp_db):
         assert all(e[0] in dates_current for e in events), "Events should match current dates"
 
 
-def test_sync_retries_failed_events(temp_db):
+def test_sync_retries_failed_events(temp_db, calendar_service):
     """Test that sync retries events with status='error'"""
     conn, db_path = temp_db
 
@@ -248,7 +248,7 @@ def test_sync_retries_failed_events(temp_db):
     conn.commit()
 
     # Mock Google Calendar service
-    mock_service = MagicMock()
+    mock_service = calendar_service
     mock_event = {"id": "event_retried"}
     mock_service.events().insert().execute.return_value = mock_event
 
@@ -274,7 +274,7 @@ def test_sync_retries_failed_events(temp_db):
         assert event[3] is None, "Error message should be cleared"
 
 
-def test_sync_handles_errors_gracefully(temp_db):
+def test_sync_handles_errors_gracefully(temp_db, calendar_service):
     """Test that sync handles API errors gracefully"""
     conn, db_path = temp_db
 
@@ -289,7 +289,7 @@ def test_sync_handles_errors_gracefully(temp_db):
     )
 
     # Mock Google Calendar service to raise error
-    mock_service = MagicMock()
+    mock_service = calendar_service
     mock_service.events().insert().execute.side_effect = Exception("API Error")
 
     with patch("services.calendar.get_google_calendar_service", return_value=mock_service):
@@ -345,3 +345,47 @@ def test_sync_empty_dates(temp_db):
     )
     row = cursor.fetchone()
     assert row[0] is not None, "calendar_synced_at should be set even for empty schedule"
+
+
+def test_batched_inserts_throttled_per_event(calendar_service):
+    """Test every insert queued into a batch request is throttled, not just the batch"""
+    from services.calendar import _insert_events_batch
+
+    calendar_service.events().insert().execute.return_value = {"id": "event123"}
+    dates = ["2026-01-08", "2026-01-22", "2026-02-05", "not-a-date"]
+
+    with patch("services.calendar.throttle_calendar") as throttle:
+        results = _insert_events_batch(calendar_service, "cal@google.com", dates, "Bendros")
+
+    # The malformed date never reaches the batch, so it isn't counted against the quota
+    assert throttle.call_count == 3
+    assert [results[d][0] for d in dates[:3]] == ["event123"] * 3
+    assert results["not-a-date"][1] is not None
+
+
+def test_batched_insert_without_response_marked_for_retry(caplog):
+    """Test a date the batch never answers comes back as an error (and is logged)"""
+    import logging
+
+    from services.calendar import _insert_events_batch
+
+    service = MagicMock()
+
+    def new_batch_http_request(callback=None):
+        queued = []
+        batch = MagicMock()
+        batch.add.side_effect = lambda request, request_id=None: queued.append(request_id)
+        # Only the first queued call gets a response
+        batch.execute.side_effect = lambda: callback(queued[0], {"id": "event123"}, None)
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    dates = ["2026-01-08", "2026-01-22"]
+
+    with caplog.at_level(logging.WARNING, logger="services.calendar"):
+        results = _insert_events_batch(service, "cal@google.com", dates, "Bendros")
+
+    assert results["2026-01-08"] == ("event123", None)
+    event_id, error = results["2026-01-22"]
+    assert event_id is None and error is not None
+    assert "2026-01-22" in caplog.text
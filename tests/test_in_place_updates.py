@@ -15,7 +15,7 @@ from services.scraper.core.db_writer import (
 )
 
 
-def test_in_place_update_some_dates_change(temp_db):
+def test_in_place_update_some_dates_change(temp_db, calendar_service):
     """Test that when some dates change, only changed dates are updated"""
     conn, _db_path = temp_db
 
@@ -66,7 +66,7 @@ def test_in_place_update_some_dates_change(temp_db):
     conn.commit()
 
     # Mock Google Calendar service
-    mock_service = MagicMock()
+    mock_service = calendar_service
     mock_event_new = {"id": "event_new"}
     mock_service.events().insert().execute.return_value = mock_event_new
 
@@ -99,7 +99,7 @@ def test_in_place_update_some_dates_change(temp_db):
         assert event_1_8[2] == "created", "Status should be 'created'"
 
 
-def test_in_place_update_all_dates_change(temp_db):
+def test_in_place_update_all_dates_change(temp_db, calendar_service):
     """Test that when all dates change, all events are updated"""
     conn, _db_path = temp_db
 
@@ -139,7 +139,7 @@ def test_in_place_update_all_dates_change(temp_db):
     conn.commit()
 
     # Mock Google Calendar service
-    mock_service = MagicMock()
+    mock_service = calendar_service
     mock_event_new = {"id": "event_new"}
     mock_service.events().insert().execute.return_value = mock_event_new
 
@@ -150,6 +150,9 @@ def test_in_place_update_all_dates_change(temp_db):
         assert result["success"] is True
         assert result["events_deleted"] == 2, "Should delete 2 old events"
         assert result["events_added"] == 2, "Should add 2 new events"
+        assert mock_service.new_batch_http_request.call_count == 1, (
+            "New events should be inserted with one batch request"
+        )
 
         # Verify calendar_stream_events table has new dates
         cursor.execute(
@@ -314,3 +314,67 @@ def test_schedule_multi_street_inherits_villagewide_pdf_rows(temp_db):
         assert "plastikas" in payload["available_waste_types"]
         assert "plastikas" in payload["schedules"]
         assert payload["schedules"]["plastikas"]["dates"][0]["date"] == "2026-01-06"
+
+
+def test_bulk_availability_matches_per_selection(temp_db):
+    from services.api.db import (
+        get_available_waste_types_for_house_numbers,
+        get_available_waste_types_for_selection,
+        get_available_waste_types_for_streets,
+    )
+
+    conn, _db_path = temp_db
+
+    sen, village = "TestSen", "BulkVillage"
+    for street, house_numbers in [
+        ("Main Street", None),
+        ("Bucket Street", "1-10"),
+        ("Bucket Street", "11-20"),
+    ]:
+        _seed_bendros_location(
+            conn=conn,
+            seniunija=sen,
+            village=village,
+            street=street,
+            house_numbers=house_numbers,
+            dates=[date(2026, 1, 2)],
+            kaimai_str=f"{village} ({street} {house_numbers or ''})",
+        )
+    # Village-wide plastikas, stiklas only for one Bucket Street bucket
+    _seed_pdf_row(
+        source_file="bulk_plastikas.pdf",
+        waste_type="plastikas",
+        seniunija=sen,
+        village=village,
+        street="",
+        dates=[date(2026, 2, 1)],
+        kaimai_str=f"{village} plastikas",
+    )
+    _seed_pdf_row(
+        source_file="bulk_stiklas.pdf",
+        waste_type="stiklas",
+        seniunija=sen,
+        village=village,
+        street="Bucket Street",
+        house_numbers="11-20",
+        dates=[date(2026, 3, 1)],
+        kaimai_str=f"{village} stiklas",
+    )
+
+    streets = ["", "Main Street", "Bucket Street"]
+    bulk = get_available_waste_types_for_streets(seniunija=sen, village=village, streets=streets)
+    for street in streets:
+        assert bulk[street] == get_available_waste_types_for_selection(
+            seniunija=sen, village=village, street=street, house_numbers=None
+        )
+    assert bulk["Bucket Street"]["bendros_requires_house_numbers"] is True
+
+    buckets = ["", "1-10", "11-20"]
+    bulk = get_available_waste_types_for_house_numbers(
+        seniunija=sen, village=village, street="Bucket Street", house_numbers=buckets
+    )
+    for bucket in buckets:
+        assert bulk[bucket] == get_available_waste_types_for_selection(
+            seniunija=sen, village=village, street="Bucket Street", house_numbers=bucket
+        )
+    assert bulk["11-20"]["available_waste_types"] == ["bendros", "plastikas", "stiklas"]